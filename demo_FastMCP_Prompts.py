@@ -171,3 +171,494 @@ def sync_prompt(topic: str) -> str:
     return f"Sync discussion about: {topic}"
 
 """ FastMCP allows MCP Context to be passed to prompts for advanced use cases."""
+
+
+"""Typed argument conversion
+
+Every prompts/get converts the string arguments again: inspect.signature of the function, an
+adapter lookup per argument, then validate_json and, when that raises, validate_python.
+
+CompiledArgsPrompt builds one converter per argument when the prompt is created:
+    str (or unannotated) arguments are passed through, no work at all
+    Everything else keeps FunctionPrompt's rule, validate_json and validate_python when that fails
+        (str | None with "123" stays "123", Any with "hello" stays "hello"), with the adapter's
+        bound methods looked up once instead of a signature and adapter lookup per call
+    Typed values (int, list[int], dict[str, str]...) are decoded and validated in one pass by
+        pydantic's JSON parser, the fallback only runs for values that are not JSON
+
+check_converters() compares both paths over a set of annotations and values.
+
+CompiledPromptProvider stores the prompts registered with @provider.prompt as CompiledArgsPrompt.
+"""
+
+import inspect
+import json
+import time
+from typing import Any, Callable, Literal
+
+import pydantic_core
+from pydantic import PrivateAttr, TypeAdapter
+
+from fastmcp.exceptions import PromptError
+from fastmcp.prompts.function_prompt import FunctionPrompt
+from fastmcp.server.providers import LocalProvider
+from fastmcp.utilities.types import get_cached_typeadapter
+
+
+def string_converter(annotation: Any) -> Callable[[str], Any] | None:
+    if annotation is inspect.Parameter.empty or annotation is str:
+        return None
+    adapter: TypeAdapter = get_cached_typeadapter(annotation)
+    validate_json, validate_python = adapter.validate_json, adapter.validate_python
+
+    def convert(value: str) -> Any:
+        try:
+            return validate_json(value)
+        except (ValueError, TypeError, pydantic_core.ValidationError):
+            return validate_python(value)
+
+    return convert
+
+
+class CompiledArgsPrompt(FunctionPrompt):
+    _converters: dict[str, Callable[[str], Any] | None] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        # self.fn is already wrapped without injected parameters (Context, Depends)
+        self._converters = {
+            name: string_converter(param.annotation) for name, param in inspect.signature(self.fn).parameters.items()
+        }
+
+    def _convert_string_arguments(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        converters = self._converters
+        converted = {}
+        for name, value in kwargs.items():
+            convert = converters.get(name)
+            if convert is None or not isinstance(value, str):
+                converted[name] = value
+                continue
+            try:
+                converted[name] = convert(value)
+            except (ValueError, TypeError, pydantic_core.ValidationError) as e:
+                raise PromptError(
+                    f"Could not convert argument '{name}' with value '{value[:200]}' to the expected type. Error: {e}"
+                ) from e
+        return converted
+
+
+class CompiledPromptProvider(LocalProvider):
+    def _add_component(self, component):
+        if type(component) is FunctionPrompt:
+            component = CompiledArgsPrompt.model_construct(_fields_set=component.model_fields_set, **component.__dict__)
+        return super()._add_component(component)
+
+
+prompts = CompiledPromptProvider()
+
+@prompts.prompt
+def sum_numbers(numbers: list[int]) -> str:
+    return f"The numbers add up to {sum(numbers)}. Explain how you would verify it."
+
+@prompts.prompt
+def translate(labels: dict[str, str], detail_level: int = 3) -> str:
+    return f"Translate these labels with detail level {detail_level}: {labels}"
+
+mcp = FastMCP("TypedPrompts", providers=[prompts])
+
+
+# Compiled and plain conversion must agree, converted value or PromptError
+
+def check_converters() -> None:
+    cases = [
+        (int, ["5", "abc"]),
+        (list[int], ["[1, 2]", "1"]),
+        (dict[str, str], ['{"a": "b"}']),
+        (str | None, ["hello", "123", "null"]),
+        (Any, ["hello", "123", "[1]"]),
+        (int | str, ["abc", "123"]),
+        (Literal["a", "b"] | None, ["a", "c"]),
+        (Literal["a", "b"], ["a", '"a"']),
+    ]
+    for annotation, values in cases:
+        def fn(value: annotation) -> str:
+            return str(value)
+
+        plain = FunctionPrompt.from_function(fn)
+        compiled = CompiledArgsPrompt.from_function(fn)
+        for value in values:
+            outcomes = []
+            for prompt in (plain, compiled):
+                try:
+                    outcomes.append(prompt._convert_string_arguments({"value": value}))
+                except PromptError:
+                    outcomes.append(PromptError)
+            assert outcomes[0] == outcomes[1], (annotation, value, outcomes)
+
+# check_converters()
+
+
+# Benchmark: render with a large list[int] argument and many small typed calls, FunctionPrompt vs CompiledArgsPrompt
+
+async def benchmark_prompt_conversion(list_size: int = 100_000, calls: int = 10_000) -> dict[str, float]:
+    def total(numbers: list[int]) -> str:
+        return f"Sum: {sum(numbers)}"
+
+    def explain(topic: str, detail_level: int = 5) -> str:
+        return f"Explain '{topic}' with a detail level of {detail_level}."
+
+    numbers = json.dumps(list(range(list_size)))
+    results = {}
+    for label, prompt_cls in (("function", FunctionPrompt), ("compiled", CompiledArgsPrompt)):
+        big = prompt_cls.from_function(total)
+        start = time.perf_counter()
+        await big.render({"numbers": numbers})
+        results[f"{label}_large_list_ms"] = (time.perf_counter() - start) * 1000
+
+        small = prompt_cls.from_function(explain)
+        start = time.perf_counter()
+        for _ in range(calls):
+            small._convert_string_arguments({"topic": "caching", "detail_level": "7"})
+        results[f"{label}_convert_us"] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+# asyncio.run(benchmark_prompt_conversion())
+
+
+"""Memoized prompts
+
+ask_about_topic, detailed_explanation or data_analysis_prompt always return the same messages for
+the same arguments, yet every prompts/get converts the arguments, calls the function, builds the
+Message objects and converts them to the MCP result again.
+
+MemoizedPrompt is opt-in per prompt:
+    The key is the converted (typed) arguments, "5" and 5 for detail_level: int hit the same entry
+    Arguments are converted once, a miss calls the function with them (call_prompt_fn) instead of
+        FunctionPrompt.render, which would convert the converted values again
+    The cache keeps the final MCP GetPromptResult, a hit skips the function, the Message objects
+        and the MCP conversion
+    Bounded LRU (maxsize) with an optional TTL in seconds
+    cache_info() reports hits, misses, hit rate and size
+
+Only for pure prompts: no Context, no I/O, nothing that changes between calls.
+"""
+
+from collections import OrderedDict
+
+from mcp.types import GetPromptResult
+
+from fastmcp.prompts import PromptResult
+from fastmcp.utilities.async_utils import call_sync_fn_in_threadpool
+
+
+async def call_prompt_fn(prompt: FunctionPrompt, kwargs: dict[str, Any]) -> PromptResult:
+    """FunctionPrompt.render after argument conversion, for kwargs that are already converted."""
+    try:
+        if inspect.iscoroutinefunction(prompt.fn):
+            result = await prompt.fn(**kwargs)
+        else:
+            result = await call_sync_fn_in_threadpool(prompt.fn, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return prompt.convert_result(result)
+    except Exception as e:
+        raise PromptError(f"Error rendering prompt {prompt.name}.") from e
+
+
+class FrozenPromptResult(PromptResult):
+    """PromptResult whose MCP form is built once."""
+
+    _mcp_result: GetPromptResult = PrivateAttr()
+
+    @classmethod
+    def freeze(cls, result: PromptResult) -> "FrozenPromptResult":
+        frozen = cls(result.messages, description=result.description, meta=result.meta)
+        frozen._mcp_result = result.to_mcp_prompt_result()
+        return frozen
+
+    def to_mcp_prompt_result(self) -> GetPromptResult:
+        return self._mcp_result
+
+
+class MemoizedPrompt(CompiledArgsPrompt):
+    cache_size: int = 256
+    cache_ttl: float | None = None
+    _cache: OrderedDict[bytes, tuple[FrozenPromptResult, float]] = PrivateAttr(default_factory=OrderedDict)
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    @classmethod
+    def memoize(cls, fn, *, maxsize: int = 256, ttl: float | None = None, **kwargs: Any) -> "MemoizedPrompt":
+        prompt = cls.from_function(fn, **kwargs)
+        prompt.cache_size = maxsize
+        prompt.cache_ttl = ttl
+        return prompt
+
+    async def render(self, arguments: dict[str, Any] | None = None) -> PromptResult:
+        arguments = arguments or {}
+        missing = {argument.name for argument in self.arguments or [] if argument.required} - arguments.keys()
+        if missing:
+            raise ValueError(f"Missing required arguments: {missing}")
+        return await self.render_converted(self._convert_string_arguments(dict(arguments)))
+
+    async def render_converted(self, kwargs: dict[str, Any]) -> PromptResult:
+        """Render from arguments already converted by _convert_string_arguments."""
+        key = pydantic_core.to_json(sorted(kwargs.items()), fallback=str)
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            result, stored_at = entry
+            if self.cache_ttl is None or time.monotonic() - stored_at < self.cache_ttl:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return result
+            del self._cache[key]
+
+        self._misses += 1
+        result = FrozenPromptResult.freeze(await call_prompt_fn(self, kwargs))
+        self._cache[key] = (result, time.monotonic())
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def cache_info(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total else 0.0,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+            "ttl": self.cache_ttl,
+        }
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+
+
+def explanation(topic: str, detail_level: int = 5) -> str:
+    """Generates a detailed explanation of a topic."""
+    return f"Please provide a detailed explanation of '{topic}' with a detail level of {detail_level}."
+
+memoized_prompts = [
+    MemoizedPrompt.memoize(explanation, name="memoized_explanation", maxsize=1024),
+    MemoizedPrompt.memoize(data_analysis_prompt, name="memoized_data_analysis", maxsize=256, ttl=300),
+]
+for memoized in memoized_prompts:
+    mcp.add_prompt(memoized)
+
+# Hit rate per memoized prompt, for dashboards
+@mcp.resource("stats://prompt-cache")
+def prompt_cache_stats() -> str:
+    return json.dumps({prompt.name: prompt.cache_info() for prompt in memoized_prompts})
+
+
+"""Large prompt arguments
+
+code_review(code) copies a multi-MB submission several times: the f-string that wraps it in a
+code fence, TextContent validation, the MCP message models, then JSON encoding of the response.
+
+Large argument path:
+    PromptArgumentLimits middleware rejects oversized arguments in on_get_prompt, before any
+        conversion, validation or rendering (per prompt limits, default 1 MB)
+    The code is attached as an embedded text resource instead of being pasted into an f-string,
+        the argument string is the same object from request decoding to response encoding
+    The content models are built with model_construct, pydantic does not re-validate (re-scan)
+        the text
+The remaining copies are the request JSON decoding and the response JSON encoding.
+"""
+
+import tracemalloc
+
+import mcp.types as mcp_types
+from mcp.shared.exceptions import McpError
+from pydantic import AnyUrl
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+SUBMISSION_URI = AnyUrl("file:///submission")
+
+
+class PromptArgumentLimits(Middleware):
+    def __init__(self, default_limit: int = 1024 * 1024, limits: dict[str, int] | None = None):
+        self.default_limit = default_limit
+        self.limits = limits or {}
+
+    def check(self, name: str, arguments: dict[str, Any] | None) -> None:
+        """Raise INVALID_PARAMS when a string argument of prompt name is over its limit."""
+        limit = self.limits.get(name, self.default_limit)
+        for argument, value in (arguments or {}).items():
+            if isinstance(value, str) and len(value) > limit:
+                raise McpError(
+                    mcp_types.ErrorData(
+                        code=mcp_types.INVALID_PARAMS,
+                        message=f"Argument '{argument}' of prompt '{name}' has {len(value)} characters, the limit is {limit}",
+                    )
+                )
+
+    async def on_get_prompt(self, context: MiddlewareContext, call_next):
+        self.check(context.message.name, context.message.arguments)
+        return await call_next(context)
+
+
+def attached_text(text: str, uri: AnyUrl = SUBMISSION_URI, mime_type: str = "text/plain") -> Message:
+    """User message carrying text as an embedded resource, without copying or re-validating it."""
+    contents = mcp_types.TextResourceContents.model_construct(uri=uri, mimeType=mime_type, text=text)
+    return Message(mcp_types.EmbeddedResource.model_construct(type="resource", resource=contents))
+
+
+@mcp.prompt
+def large_code_review(code: str) -> PromptResult:
+    """Returns a code review prompt, the code is attached as a resource."""
+    return PromptResult(
+        messages=[
+            Message("Please review the attached code."),
+            attached_text(code),
+            Message("I'll analyze this code for issues.", role="assistant"),
+        ],
+        description="Code review prompt",
+        meta={"review_type": "security", "priority": "high"},
+    )
+
+mcp.add_middleware(PromptArgumentLimits(default_limit=1024 * 1024, limits={"large_code_review": 16 * 1024 * 1024}))
+
+
+# Peak memory per request for 1 MB and 10 MB code inputs, from request decoding to response encoding
+
+async def benchmark_large_prompt(sizes_mb=(1, 10)) -> dict[str, float]:
+    def pasted_review(code: str) -> PromptResult:
+        return PromptResult(
+            messages=[
+                Message(f"Please review this code:\n\n```\n{code}\n```"),
+                Message("I'll analyze this code for issues.", role="assistant"),
+            ]
+        )
+
+    results = {}
+    for size in sizes_mb:
+        code = "x = 1  # line of code\n" * (size * 1024 * 1024 // 22)
+        body = json.dumps({"name": "review", "arguments": {"code": code}}).encode()
+        del code
+        for label, fn in (("pasted", pasted_review), ("attached", large_code_review)):
+            prompt = FunctionPrompt.from_function(fn, name="review")
+            tracemalloc.start()
+            params = mcp_types.GetPromptRequestParams.model_validate_json(body)
+            result = await prompt._render(params.arguments)
+            response = result.to_mcp_prompt_result().model_dump_json(by_alias=True, exclude_none=True)
+            results[f"{label}_{size}mb_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            del params, result, response
+    return results
+
+# asyncio.run(benchmark_large_prompt())
+# Compare pasted_* and attached_* peaks, the floor is the request body, the argument string and the response
+
+
+"""Batch rendering
+
+Evaluation pipelines render the same prompt (e.g. generate_code_request) for thousands of argument
+sets, one prompts/get round trip each.
+
+render_prompt_batch(server, name, arguments_list, limits=None):
+    Looks the prompt up once (visibility and auth apply)
+    Applies the PromptArgumentLimits checks to every argument set before anything else, an
+        oversized argument rejects the whole batch as it would reject a prompts/get
+    Validates every argument set first (required arguments and type conversion), nothing is
+        rendered when a set is invalid, the error lists the bad indexes
+        (return_exceptions=True renders the valid sets and puts the errors in their slots)
+    Function prompts are rendered from the converted arguments (call_prompt_fn, the memo of a
+        MemoizedPrompt), arguments are converted once
+    Renders concurrently, at most max_concurrency at a time, sync prompt functions (sync_prompt)
+        run in the thread pool, async ones (async_prompt) on the event loop
+    Returns the PromptResults in the order of arguments_list
+
+add_batch_render_tool(server) exposes it to clients as the render_prompt_batch tool. Middleware runs
+once for the tool call, not per argument set, so the tool applies the server's PromptArgumentLimits
+itself and refuses batches of more than max_batch_size argument sets.
+"""
+
+import asyncio
+
+from fastmcp.exceptions import NotFoundError
+from fastmcp.prompts import Prompt
+
+
+async def render_prompt_batch(
+    server: FastMCP,
+    name: str,
+    arguments_list: list[dict[str, Any]],
+    *,
+    max_concurrency: int = 16,
+    return_exceptions: bool = False,
+    limits: PromptArgumentLimits | None = None,
+) -> list[PromptResult | Exception]:
+    prompt: Prompt | None = await server.get_prompt(name)
+    if prompt is None:
+        raise NotFoundError(f"Unknown prompt: {name!r}")
+
+    if limits is not None:
+        for arguments in arguments_list:
+            limits.check(prompt.name, arguments)
+
+    # Validate everything before rendering anything
+    required = {argument.name for argument in prompt.arguments or [] if argument.required}
+    converted: list[dict[str, Any] | None] = []
+    errors: dict[int, PromptError] = {}
+    for index, arguments in enumerate(arguments_list):
+        missing = required - arguments.keys()
+        try:
+            if missing:
+                raise PromptError(f"Missing required arguments: {sorted(missing)}")
+            if isinstance(prompt, FunctionPrompt):
+                arguments = prompt._convert_string_arguments(dict(arguments))
+            converted.append(arguments)
+        except PromptError as e:
+            errors[index] = e
+            converted.append(None)
+
+    if errors and not return_exceptions:
+        shown = "; ".join(f"[{index}] {error}" for index, error in list(errors.items())[:10])
+        raise PromptError(f"{len(errors)} of {len(arguments_list)} argument sets are invalid: {shown}")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def render(index: int, arguments: dict[str, Any] | None) -> PromptResult | Exception:
+        if arguments is None:
+            return errors[index]
+        async with semaphore:
+            try:
+                if isinstance(prompt, MemoizedPrompt):
+                    return await prompt.render_converted(arguments)
+                if isinstance(prompt, FunctionPrompt):
+                    return await call_prompt_fn(prompt, arguments)
+                return prompt.convert_result(await prompt.render(arguments))
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+    return await asyncio.gather(*(render(index, arguments) for index, arguments in enumerate(converted)))
+
+
+def add_batch_render_tool(server: FastMCP, max_concurrency: int = 16, max_batch_size: int = 1000) -> None:
+    @server.tool(name="render_prompt_batch")
+    async def render_prompt_batch_tool(name: str, arguments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Render one prompt for many argument sets, results are returned in the same order."""
+        if len(arguments) > max_batch_size:
+            raise McpError(
+                mcp_types.ErrorData(
+                    code=mcp_types.INVALID_PARAMS,
+                    message=f"Batch has {len(arguments)} argument sets, the limit is {max_batch_size}",
+                )
+            )
+        # Same limits as prompts/get, looked up per call so middleware added later applies too
+        limits = next((m for m in server.middleware if isinstance(m, PromptArgumentLimits)), None)
+        results = await render_prompt_batch(server, name, arguments, max_concurrency=max_concurrency, limits=limits)
+        return [result.to_mcp_prompt_result().model_dump(by_alias=True, exclude_none=True) for result in results]
+
+
+# e.g. an evaluation run over 5000 label sets, string arguments are converted as in prompts/get
+label_sets = [{"labels": json.dumps({"title": f"Item {i}"}), "detail_level": "2"} for i in range(5000)]
+# results = asyncio.run(render_prompt_batch(mcp, "translate", label_sets, max_concurrency=32))
+# results = asyncio.run(render_prompt_batch(mcp, "sum_numbers", [{"numbers": [1, 2]}, {}], return_exceptions=True))
+add_batch_render_tool(mcp)
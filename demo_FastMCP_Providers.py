@@ -41,6 +41,9 @@ ToolTransform: Modify tool schemas
 When a client requests a tool, FasMCP queries providers in registration order
 The first provider to return a matching tool is used to handle the request
 
+Providers can be queried concurrently, the precedence still follows registration order
+(see FanOutProvider in "Concurrent provider fan-out")
+
 LOCALPROVIDER is always first, so decorator-defined tools take precedence
 
 """
@@ -115,6 +118,130 @@ server_a = FastMCP("ServerA", providers=[shared_tools])
 server_b = FastMCP("ServerB", providers=[shared_tools])
 
 
+### Shared compiled schemas
+
+""" The provider holds one Tool object per function and every server gets that same object,
+but each server still compiles its own views of it:
+    tools/list calls tool.to_mcp_tool() for every tool on every list, per server
+    the low-level server keeps its own copy of every MCP tool definition (used for validation)
+    strict_input_validation runs jsonschema.validate per call: it checks the schema against the
+        meta-schema and builds a new validator every time
+
+SharedSchemaProvider stores tools as CompiledFunctionTool. The compiled parts live on the component,
+so every server the provider is attached to reuses them:
+    the MCP tool definition is built once per listed name and kept while version, description,
+        tags and the schema objects stay the same (one entry per name, replaced on change)
+        namespaced copies (model_copy) share the cache, only the name changes
+    the JSON schema validator is checked and built once per input schema object
+    strict=True validates the arguments with it, create the servers without
+        strict_input_validation so the per-call jsonschema.validate is skipped
+
+Argument conversion (pydantic TypeAdapter) is already cached per function by fastmcp.
+"""
+
+import time
+import tracemalloc
+from typing import Any
+
+import jsonschema
+import mcp.types as mcp_types
+from pydantic import PrivateAttr
+
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.function_tool import FunctionTool
+from fastmcp.tools.tool import ToolResult
+
+
+class CompiledFunctionTool(FunctionTool):
+    strict: bool = False
+    # Shallow-copied by model_copy, so transformed copies share it
+    # ("mcp", name) -> (fields, schema objects, MCP tool), "validator" -> (parameters, validator)
+    _compiled: dict[Any, Any] = PrivateAttr(default_factory=dict)
+
+    def to_mcp_tool(self, **overrides: Any) -> mcp_types.Tool:
+        if set(overrides) - {"name"}:
+            return super().to_mcp_tool(**overrides)
+        key = ("mcp", overrides.get("name", self.name))
+        fields = (self.version, self.title, self.description, tuple(sorted(self.tags)))
+        # The entry holds the schema dicts, an identity check cannot match a new dict at a reused address
+        sources = (self.parameters, self.output_schema, self.meta)
+        entry = self._compiled.get(key)
+        if entry is None or entry[0] != fields or any(old is not new for old, new in zip(entry[1], sources)):
+            entry = self._compiled[key] = (fields, sources, super().to_mcp_tool(**overrides))
+        return entry[2]
+
+    @property
+    def validator(self) -> jsonschema.protocols.Validator:
+        entry = self._compiled.get("validator")
+        if entry is None or entry[0] is not self.parameters:
+            validator_cls = jsonschema.validators.validator_for(self.parameters)
+            validator_cls.check_schema(self.parameters)
+            entry = self._compiled["validator"] = (self.parameters, validator_cls(self.parameters))
+        return entry[1]
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        if self.strict:
+            error = jsonschema.exceptions.best_match(self.validator.iter_errors(arguments))
+            if error is not None:
+                raise ToolError(f"Input validation error: {error.message}")
+        return await super().run(arguments)
+
+
+class SharedSchemaProvider(LocalProvider):
+    def __init__(self, *args: Any, strict: bool = False, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._strict = strict
+
+    def _add_component(self, component):
+        if type(component) is FunctionTool:
+            component = CompiledFunctionTool.model_construct(
+                _fields_set=component.model_fields_set | {"strict"},
+                **component.__dict__,
+                strict=self._strict,
+            )
+        return super()._add_component(component)
+
+
+shared_tools = SharedSchemaProvider(strict=True)
+
+@shared_tools.tool
+def shared_greet(name: str) -> str:
+    return f"Hello from the shared provider, {name}!"
+
+@shared_tools.tool
+def shared_farewell(name: str) -> str:
+    return f"Goodbye from the shared provider, {name}!"
+
+server_a = FastMCP("ServerA", providers=[shared_tools])
+server_b = FastMCP("ServerB", providers=[shared_tools])
+
+
+# Benchmark: time and retained memory for N servers listing the same provider
+
+async def benchmark_shared_schemas(provider_cls=LocalProvider, servers: int = 300, tools: int = 50) -> dict[str, float]:
+    provider = provider_cls()
+    for i in range(tools):
+
+        def tool_fn(query: str, limit: int = 10, tags: list[str] | None = None) -> dict:
+            return {"query": query}
+
+        provider.add_tool(Tool.from_function(tool_fn, name=f"tool_{i}"))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(servers):
+        server = FastMCP(f"Tenant{i}", providers=[provider])
+        # Same path as the first tools/call: fills the low-level tool cache
+        await server._mcp_server.request_handlers[mcp_types.ListToolsRequest](None)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "retained_mb": current / 1024 / 1024}
+
+# asyncio.run(benchmark_shared_schemas(LocalProvider))
+# asyncio.run(benchmark_shared_schemas(SharedSchemaProvider))
+
+
 
 
 # Filesystem provider
@@ -187,6 +314,336 @@ Mutliple components: A single file can contain multiple decorated functions, and
 """
 
 
+### Manifest cached discovery
+
+""" FileSystemProvider imports every .py file at startup to find the decorated functions.
+With hundreds of plugin modules startup takes seconds.
+
+ManifestFileSystemProvider writes a manifest (.fastmcp-manifest.json in the root) with the
+component names, schemas and the mtime of each source file.
+On the next startup, files whose mtime did not change are NOT imported, placeholder components
+are registered from the manifest instead (clients can list them, schemas are already there).
+
+A module is imported only when:
+    One of its components is called / read / rendered for the first time
+    Its source file changed (mtime differs from the manifest), the schema may be out of date
+    It is new (not in the manifest yet)
+    It defines resource templates (these are always imported, no placeholder for them)
+    One of its components has auth checks or task support, auth callables cannot be saved in the
+        manifest and background tasks are registered with Docket at startup, so these are always
+        imported too
+
+A placeholder dispatches through the real component's _run / _read / _render once loaded, and the
+real component's auth checks run again first.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+from pydantic import PrivateAttr
+
+from fastmcp.exceptions import AuthorizationError
+from fastmcp.prompts import Prompt
+from fastmcp.resources import Resource, ResourceTemplate
+from fastmcp.server.auth import AuthContext, run_auth_checks
+from fastmcp.server.providers.filesystem_discovery import discover_files, extract_components, import_module_from_file
+from fastmcp.server.server import _get_auth_context
+from fastmcp.tools import Tool
+from fastmcp.utilities.components import FastMCPComponent
+
+logger = logging.getLogger(__name__)
+
+# Fields saved in the manifest for each component type
+MANIFEST_FIELDS = {
+    "tools": {"name", "version", "title", "description", "tags", "meta", "parameters", "output_schema", "annotations"},
+    "resources": {"name", "version", "title", "description", "tags", "meta", "uri", "mime_type", "annotations"},
+    "prompts": {"name", "version", "title", "description", "tags", "meta", "arguments"},
+}
+
+
+class LazyTool(Tool):
+    source: Path
+    _provider: Any = PrivateAttr(default=None)
+
+    async def run(self, arguments: dict[str, Any]):
+        tool = await self._provider.load(self)
+        return await tool.run(arguments)
+
+    async def _run(self, arguments: dict[str, Any], task_meta=None):
+        tool = await self._provider.load(self)
+        return await tool._run(arguments, task_meta)
+
+
+class LazyResource(Resource):
+    source: Path
+    _provider: Any = PrivateAttr(default=None)
+
+    async def read(self):
+        resource = await self._provider.load(self)
+        return await resource.read()
+
+    async def _read(self, task_meta=None):
+        resource = await self._provider.load(self)
+        return await resource._read(task_meta)
+
+
+class LazyPrompt(Prompt):
+    source: Path
+    _provider: Any = PrivateAttr(default=None)
+
+    async def render(self, arguments: dict[str, Any] | None = None):
+        prompt = await self._provider.load(self)
+        return await prompt.render(arguments)
+
+    async def _render(self, arguments: dict[str, Any] | None = None, task_meta=None):
+        prompt = await self._provider.load(self)
+        return await prompt._render(arguments, task_meta)
+
+
+PLACEHOLDER_TYPES = {"tools": LazyTool, "resources": LazyResource, "prompts": LazyPrompt}
+
+
+class ManifestFileSystemProvider(LocalProvider):
+    def __init__(self, root: str | Path = ".", manifest_path: Path | None = None):
+        super().__init__(on_duplicate="replace")
+        self._root = Path(root).resolve()
+        self._manifest_path = manifest_path or self._root / ".fastmcp-manifest.json"
+        self._manifest: dict[str, dict[str, Any]] = {}
+        self._imported: set[Path] = set()
+        # Keys of the components registered from each source file
+        self._file_keys: dict[Path, set[str]] = {}
+        self._import_lock = asyncio.Lock()
+        self._load_manifest()
+
+    def _load_manifest(self) -> None:
+        try:
+            previous = json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError):
+            previous = {}
+
+        for file_path in discover_files(self._root):
+            relative = file_path.relative_to(self._root).as_posix()
+            entry = previous.get(relative)
+            if entry is not None and entry["mtime"] == file_path.stat().st_mtime and not entry["eager"]:
+                self._register_placeholders(file_path, entry)
+                self._manifest[relative] = entry
+            else:
+                self._import_file(file_path)
+
+        if self._manifest != previous:
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest, indent=1, sort_keys=True))
+        tmp_path.replace(self._manifest_path)
+
+    def _register_placeholders(self, file_path: Path, entry: dict[str, Any]) -> None:
+        keys = self._file_keys.setdefault(file_path, set())
+        for kind, placeholder_type in PLACEHOLDER_TYPES.items():
+            for data in entry[kind]:
+                placeholder = placeholder_type(**data, source=file_path)
+                placeholder._provider = self
+                keys.add(self._add_component(placeholder).key)
+
+    def _import_module(self, file_path: Path):
+        return import_module_from_file(file_path)
+
+    def _scan_file(self, file_path: Path) -> tuple[float, list[FastMCPComponent]] | None:
+        """Import a module and return its components, touches no provider state (safe in a thread)."""
+        try:
+            # The file can be deleted between listing and scanning
+            mtime = file_path.stat().st_mtime
+            module = self._import_module(file_path)
+        except Exception as e:
+            logger.warning(f"Failed to import {file_path}: {e}")
+            return None
+        return mtime, extract_components(module)
+
+    def _import_file(self, file_path: Path) -> bool:
+        scanned = self._scan_file(file_path)
+        if scanned is None:
+            return False
+        self._register_file(file_path, *scanned)
+        return True
+
+    def _register_file(self, file_path: Path, mtime: float, components: list[FastMCPComponent]) -> None:
+        """Register a module's real components and record them in the manifest."""
+        keys = set()
+        entry: dict[str, Any] = {"mtime": mtime, "eager": False, "tools": [], "resources": [], "prompts": []}
+        for component in components:
+            keys.add(self._add_component(component).key)
+            if component.auth is not None or component.task_config.supports_tasks():
+                entry["eager"] = True
+            if isinstance(component, ResourceTemplate):
+                entry["eager"] = True
+                continue
+            kind = "tools" if isinstance(component, Tool) else "prompts" if isinstance(component, Prompt) else "resources"
+            entry[kind].append(component.model_dump(mode="json", include=MANIFEST_FIELDS[kind]))
+
+        self._imported.add(file_path)
+        self._file_keys[file_path] = keys
+        self._manifest[file_path.relative_to(self._root).as_posix()] = entry
+
+    async def load(self, placeholder: FastMCPComponent) -> FastMCPComponent:
+        """Import the placeholder's module (once) and return the real component."""
+        async with self._import_lock:
+            if placeholder.source not in self._imported:
+                # Import in a thread, register on the event loop
+                scanned = await asyncio.to_thread(self._scan_file, placeholder.source)
+                if scanned is not None:
+                    self._register_file(placeholder.source, *scanned)
+                    self._write_manifest()
+        component = self._components.get(placeholder.key)
+        if component is None or component is placeholder:
+            raise ValueError(f"{placeholder.key} is no longer defined in {placeholder.source}")
+        # The placeholder had no auth, the real component may have gained some since the manifest was written
+        skip_auth, token = _get_auth_context()
+        if not skip_auth and component.auth is not None:
+            try:
+                allowed = run_auth_checks(component.auth, AuthContext(token=token, component=component))
+            except AuthorizationError:
+                allowed = False
+            if not allowed:
+                raise AuthorizationError(f"Not authorized to access {component.key}")
+        return component
+
+    def __repr__(self) -> str:
+        return f"ManifestFileSystemProvider(root={self._root!r})"
+
+
+mcp = FastMCP("FileSystemServer", providers=[ManifestFileSystemProvider(Path(__file__).parent / "mcp")])
+
+
+### Incremental hot reload
+
+""" Restarting the server to pick up a changed file under mcp/tools/ drops every in-flight session.
+FileSystemProvider(reload=True) is not much better, it rescans and re-imports everything on every request.
+
+HotReloadFileSystemProvider watches its root directory (watchfiles) while the server runs:
+    Only the modules that changed are imported again
+    Only the components of those modules are replaced or removed
+    Connected clients get tools/resources/prompts list_changed notifications
+
+Each reload executes the file into a NEW module object. A call that is already running keeps the
+old function (and the old module globals), so it finishes undisturbed. New calls get the new version.
+
+FastMCP has no server-wide list of sessions, ListChangedNotifier is a middleware that remembers
+the sessions it has seen so the provider can notify all of them.
+"""
+
+import importlib.util
+import sys
+import weakref
+from contextlib import asynccontextmanager
+
+from mcp.server.session import ServerSession
+from watchfiles import awatch
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+
+class ListChangedNotifier(Middleware):
+    def __init__(self):
+        self._sessions: weakref.WeakSet[ServerSession] = weakref.WeakSet()
+
+    async def on_message(self, context: MiddlewareContext, call_next):
+        # No request context (and no session) yet during initialize
+        if context.fastmcp_context is not None and context.fastmcp_context.request_context is not None:
+            self._sessions.add(context.fastmcp_context.session)
+        return await call_next(context)
+
+    async def broadcast(self) -> None:
+        for session in list(self._sessions):
+            try:
+                await session.send_tool_list_changed()
+                await session.send_resource_list_changed()
+                await session.send_prompt_list_changed()
+            except Exception:
+                # Session is closed
+                self._sessions.discard(session)
+
+
+class HotReloadFileSystemProvider(ManifestFileSystemProvider):
+    def __init__(self, root: str | Path = ".", notifier: ListChangedNotifier | None = None, **kwargs):
+        self._module_names: dict[Path, str] = {}
+        super().__init__(root, **kwargs)
+        self._notifier = notifier
+
+    def _import_module(self, file_path: Path):
+        module_name = self._module_names.get(file_path)
+        if module_name is None:
+            module = super()._import_module(file_path)
+            self._module_names[file_path] = module.__name__
+            return module
+
+        # Fresh module object instead of importlib.reload, running calls keep the old globals
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+        return module
+
+    def _reload_file(self, file_path: Path, scanned: tuple[float, list[FastMCPComponent]] | None) -> bool:
+        """Swap one file's components for the freshly scanned ones, returns True if anything changed."""
+        old_keys = self._file_keys.get(file_path, set())
+        relative = file_path.relative_to(self._root).as_posix()
+
+        if file_path.exists():
+            if scanned is None:
+                # Keep serving the previous version until the file imports again
+                return False
+            self._register_file(file_path, *scanned)
+        else:
+            self._file_keys.pop(file_path, None)
+            self._manifest.pop(relative, None)
+            self._module_names.pop(file_path, None)
+            self._imported.discard(file_path)
+
+        for key in old_keys - self._file_keys.get(file_path, set()):
+            self._components.pop(key, None)
+        return True
+
+    async def _watch(self) -> None:
+        async for changes in awatch(self._root):
+            changed_files = {
+                Path(path)
+                for change, path in changes
+                if path.endswith(".py") and not path.endswith("__init__.py") and "__pycache__" not in path
+            }
+            if not changed_files:
+                continue
+            async with self._import_lock:
+                reloaded = []
+                for path in sorted(changed_files):
+                    # Import in a thread, swap the components on the event loop
+                    scanned = await asyncio.to_thread(self._scan_file, path) if path.exists() else None
+                    reloaded.append(self._reload_file(path, scanned))
+                self._write_manifest()
+            if any(reloaded):
+                logger.info(f"Reloaded {len(changed_files)} module(s) from {self._root}")
+                if self._notifier is not None:
+                    await self._notifier.broadcast()
+
+    @asynccontextmanager
+    async def lifespan(self):
+        task = asyncio.create_task(self._watch())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    def __repr__(self) -> str:
+        return f"HotReloadFileSystemProvider(root={self._root!r})"
+
+
+notifier = ListChangedNotifier()
+mcp = FastMCP("HotReloadServer", providers=[HotReloadFileSystemProvider(Path(__file__).parent / "mcp", notifier=notifier)])
+mcp.add_middleware(notifier)
+
+
 ### Skills Providers
 
 """ Agent skills are directories that contain instrucctions
@@ -217,6 +674,235 @@ The directory name becomes the skill identifier.
 
 """
 
+### Indexed skills directory
+
+""" SkillsDirectoryProvider creates one SkillProvider per skill at startup: it reads every SKILL.md
+and hashes EVERY supporting file. A resources/read is then sent to all the skill providers until one answers.
+With thousands of skills and large supporting files it reads far more than clients ask for.
+
+IndexedSkillsDirectoryProvider keeps a lightweight index (JSON, persisted between runs in the FastMCP
+home directory, one file per set of roots, nothing is written into the skills directories):
+    Skill name, SKILL.md front matter and description, file paths, sizes and mtimes
+    SKILL.md is parsed again only when its mtime changes, files are only stat'ed
+    File hashes are computed when a client reads the skill's _manifest, and kept in the index
+
+File contents are read only on resources/read, off the event loop.
+Files bigger than chunk_size are streamed in chunks: skill://{skill}/{path}?offset=N returns the
+bytes from N, the content meta has "nextOffset" until the end of the file.
+
+A resource URI is routed to its skill by name (one dictionary lookup) instead of asking every skill.
+"""
+
+import hashlib
+import mimetypes
+import os
+from stat import S_ISREG
+
+import fastmcp
+from fastmcp.exceptions import ResourceError
+from fastmcp.resources import ResourceContent, ResourceResult
+from fastmcp.server.providers.skills import SkillProvider
+from fastmcp.server.providers.skills._common import SkillFileInfo, SkillInfo, compute_file_hash, parse_frontmatter
+from fastmcp.server.providers.skills.skill_provider import SkillFileTemplate
+
+
+class ChunkedSkillFileTemplate(SkillFileTemplate):
+    chunk_size: int = 1024 * 1024
+
+    async def read(self, arguments: dict[str, Any]) -> ResourceResult:
+        file_path = arguments.get("path", "")
+        full_path = (self.skill_info.path / file_path).resolve()
+        if not full_path.is_relative_to(self.skill_info.path):
+            raise ValueError(f"Invalid path: {file_path} escapes skill directory")
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        offset = int(arguments.get("offset") or 0)
+        if offset < 0:
+            raise ResourceError(f"Invalid offset {offset}: must be >= 0")
+        mime_type, _ = mimetypes.guess_type(str(full_path))
+        mime_type = mime_type or "application/octet-stream"
+
+        def read_chunk() -> tuple[bytes, int]:
+            with open(full_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                f.seek(offset)
+                return f.read(self.chunk_size), size
+
+        data, size = await asyncio.to_thread(read_chunk)
+        if offset == 0 and len(data) == size:
+            content = data.decode() if mime_type.startswith("text/") else data
+            return ResourceResult([ResourceContent(content, mime_type=mime_type)])
+
+        # Chunks can split multi-byte characters, they are always sent as binary
+        end = offset + len(data)
+        meta = {"offset": offset, "size": size, "nextOffset": end if end < size else None}
+        return ResourceResult([ResourceContent(data, mime_type=mime_type, meta=meta)])
+
+
+class IndexedSkillProvider(SkillProvider):
+    def __init__(self, skill_info: SkillInfo, owner: "IndexedSkillsDirectoryProvider"):
+        # The skill comes from the index, SkillProvider._load_skill is not called
+        Provider.__init__(self)
+        self._skill_path = skill_info.path
+        self._main_file_name = owner._main_file_name
+        self._supporting_files = owner._supporting_files
+        self._skill_info = skill_info
+        self._owner = owner
+
+    async def _get_resource(self, uri: str, version: VersionSpec | None = None) -> Resource | None:
+        if uri == f"skill://{self.skill_info.name}/_manifest":
+            await asyncio.to_thread(self._owner.fill_hashes, self.skill_info)
+        return await super()._get_resource(uri, version)
+
+    def _file_template(self) -> ChunkedSkillFileTemplate:
+        skill = self.skill_info
+        return ChunkedSkillFileTemplate(
+            uri_template=f"skill://{skill.name}/{{path*}}{{?offset}}",
+            name=f"{skill.name}_files",
+            description=f"Access files within {skill.name}",
+            mime_type="application/octet-stream",
+            parameters={
+                "type": "object",
+                "properties": {"path": {"type": "string"}, "offset": {"type": "integer"}},
+                "required": ["path"],
+            },
+            skill_info=skill,
+            chunk_size=self._owner.chunk_size,
+        )
+
+    async def _list_resource_templates(self) -> Sequence[ResourceTemplate]:
+        return [self._file_template()] if await super()._list_resource_templates() else []
+
+    async def _get_resource_template(self, uri: str, version: VersionSpec | None = None) -> ResourceTemplate | None:
+        if await super()._get_resource_template(uri, version) is None:
+            return None
+        return self._file_template()
+
+
+def default_index_path(roots) -> Path:
+    """Index file for a set of skills roots, under the FastMCP home directory."""
+    roots = [roots] if isinstance(roots, (str, Path)) else roots
+    digest = hashlib.sha256("\n".join(str(Path(root).resolve()) for root in roots).encode()).hexdigest()[:16]
+    return fastmcp.settings.home / "skills-index" / f"{digest}.json"
+
+
+class IndexedSkillsDirectoryProvider(SkillsDirectoryProvider):
+    def __init__(self, roots, index_path: Path | None = None, chunk_size: int = 1024 * 1024, **kwargs):
+        self._index_path = index_path or default_index_path(roots)
+        self.chunk_size = chunk_size
+        self._index: dict[str, dict[str, Any]] = {}
+        self._by_name: dict[str, IndexedSkillProvider] = {}
+        super().__init__(roots, **kwargs)
+
+    def _discover_skills(self) -> None:
+        try:
+            previous = json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            previous = {}
+
+        self.providers.clear()
+        self._by_name = {}
+        self._index = {}
+        for root in self._roots:
+            if not root.is_dir():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                main_file = skill_dir / self._main_file_name
+                if skill_dir.name in self._by_name or not main_file.is_file():
+                    continue
+                key = str(skill_dir.resolve())
+                try:
+                    entry = self._index_skill(skill_dir, previous.get(key))
+                except OSError:
+                    logger.exception(f"Failed to index skill: {skill_dir.name}")
+                    continue
+                self._index[key] = entry
+                provider = IndexedSkillProvider(self._skill_info(skill_dir, entry), self)
+                self._by_name[skill_dir.name] = provider
+                self.providers.append(provider)
+
+        self._discovered = True
+        if self._index != previous:
+            self._save_index()
+
+    def _index_skill(self, skill_dir: Path, previous: dict[str, Any] | None) -> dict[str, Any]:
+        main_mtime = (skill_dir / self._main_file_name).stat().st_mtime_ns
+        if previous is not None and previous["main_mtime"] == main_mtime:
+            frontmatter, description = previous["frontmatter"], previous["description"]
+        else:
+            frontmatter, body = parse_frontmatter((skill_dir / self._main_file_name).read_text())
+            description = frontmatter.get("description") or next(
+                (line.strip().lstrip("#").strip()[:200] for line in body.splitlines() if line.strip()),
+                f"Skill: {skill_dir.name}",
+            )
+
+        previous_files = {f["path"]: f for f in previous["files"]} if previous else {}
+        files = []
+        for file_path in sorted(skill_dir.rglob("*")):
+            file_stat = file_path.stat()
+            if not S_ISREG(file_stat.st_mode):
+                continue
+            relative = file_path.relative_to(skill_dir).as_posix()
+            old = previous_files.get(relative)
+            unchanged = old is not None and old["size"] == file_stat.st_size and old["mtime"] == file_stat.st_mtime_ns
+            files.append({
+                "path": relative,
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime_ns,
+                "hash": old["hash"] if unchanged else "",
+            })
+
+        return {"main_mtime": main_mtime, "frontmatter": frontmatter, "description": description, "files": files}
+
+    def _skill_info(self, skill_dir: Path, entry: dict[str, Any]) -> SkillInfo:
+        return SkillInfo(
+            name=skill_dir.name,
+            description=entry["description"],
+            path=skill_dir.resolve(),
+            main_file=self._main_file_name,
+            files=[SkillFileInfo(path=f["path"], size=f["size"], hash=f["hash"]) for f in entry["files"]],
+            frontmatter=entry["frontmatter"],
+        )
+
+    def _save_index(self) -> None:
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._index))
+            tmp_path.replace(self._index_path)
+        except OSError as e:
+            logger.debug(f"Could not write skills index {self._index_path}: {e}")
+
+    def fill_hashes(self, skill: SkillInfo) -> None:
+        """Hash the files the index has no hash for (only when the manifest is read)."""
+        entry = self._index[str(skill.path)]
+        missing = [(info, f) for info, f in zip(skill.files, entry["files"]) if not info.hash]
+        for info, f in missing:
+            info.hash = f["hash"] = compute_file_hash(skill.path / info.path)
+        if missing:
+            self._save_index()
+
+    def _provider_for(self, uri: str) -> IndexedSkillProvider | None:
+        if not uri.startswith("skill://"):
+            return None
+        return self._by_name.get(uri[len("skill://"):].split("/", 1)[0])
+
+    async def _get_resource(self, uri: str, version: VersionSpec | None = None) -> Resource | None:
+        await self._ensure_discovered()
+        provider = self._provider_for(uri)
+        return await provider.get_resource(uri, version) if provider else None
+
+    async def _get_resource_template(self, uri: str, version: VersionSpec | None = None) -> ResourceTemplate | None:
+        await self._ensure_discovered()
+        provider = self._provider_for(uri)
+        return await provider.get_resource_template(uri, version) if provider else None
+
+
+mcp = FastMCP("SkillsServer")
+mcp.add_provider(IndexedSkillsDirectoryProvider(roots=Path.home() / ".claude" / "skills"))
+
+
 """ Vendor Providesr
 
 FASMCP includes pre configured providers for popular AU coding tools.
@@ -286,6 +972,683 @@ def multiply(x: int, y: int) -> int:
 
 mcp = FastMCP("Calculator", providers=[DictProvider({"add": add, "multiply": multiply})])
 
+### Concurrent provider fan-out
+
+""" Listing components asks every provider for its _list_tools / _list_resources / _list_prompts.
+If providers are awaited one after another, tools/list latency is the SUM of all providers.
+
+FanOutProvider queries all its providers concurrently, the latency is the slowest provider
+and a per-provider timeout caps that: a provider that does not answer in time is skipped
+(logged as a warning) instead of blocking the response.
+
+The merge is deterministic and keeps AggregateProvider's rules:
+    Results are merged in registration order, not in completion order
+    When two providers return the same component key, the earlier registered provider wins
+    get_tool / get_resource / get_prompt return the highest version among the providers that
+        answered in time (registration order breaks ties), only the timeout differs from upstream
+"""
+
+from fastmcp.server.providers import AggregateProvider
+from fastmcp.utilities.versions import VersionSpec, version_sort_key
+
+
+class FanOutProvider(AggregateProvider):
+    def __init__(self, providers: Sequence[Provider] | None = None, timeout: float | None = 1.0):
+        super().__init__(providers)
+        self.timeout = timeout
+
+    async def _query(self, provider: Provider, method: str, *args):
+        try:
+            return await asyncio.wait_for(getattr(provider, method)(*args), self.timeout)
+        except TimeoutError:
+            logger.warning(f"{provider!r} did not answer {method} within {self.timeout}s, skipped")
+        except Exception as e:
+            logger.debug(f"Error during {method} from provider {provider!r}: {e}")
+        return None
+
+    async def _query_all(self, method: str, *args) -> list:
+        """Call method on every provider concurrently, results in registration order."""
+        return await asyncio.gather(*(self._query(provider, method, *args) for provider in self.providers))
+
+    async def _merge(self, method: str) -> list:
+        merged: dict[str, FastMCPComponent] = {}
+        for components in await self._query_all(method):
+            for component in components or ():
+                merged.setdefault(component.key, component)
+        return list(merged.values())
+
+    async def _highest(self, method: str, *args):
+        found = [component for component in await self._query_all(method, *args) if component is not None]
+        # max keeps the first of equal versions, the earlier registered provider
+        return max(found, key=version_sort_key) if found else None
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        return await self._merge("list_tools")
+
+    async def _list_resources(self) -> Sequence[Resource]:
+        return await self._merge("list_resources")
+
+    async def _list_resource_templates(self) -> Sequence[ResourceTemplate]:
+        return await self._merge("list_resource_templates")
+
+    async def _list_prompts(self) -> Sequence[Prompt]:
+        return await self._merge("list_prompts")
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        return await self._highest("get_tool", name, version)
+
+    async def _get_resource(self, uri: str, version: VersionSpec | None = None) -> Resource | None:
+        return await self._highest("get_resource", uri, version)
+
+    async def _get_resource_template(self, uri: str, version: VersionSpec | None = None) -> ResourceTemplate | None:
+        return await self._highest("get_resource_template", uri, version)
+
+    async def _get_prompt(self, name: str, version: VersionSpec | None = None) -> Prompt | None:
+        return await self._highest("get_prompt", name, version)
+
+
+class SlowProvider(Provider):
+    """Stand-in for an API-backed provider that sometimes hangs."""
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        await asyncio.sleep(5)
+        return []
+
+
+mcp = FastMCP(
+    "Combined",
+    providers=[
+        FanOutProvider(
+            [
+                shared_tools,
+                DictProvider({"add": add, "multiply": multiply}),
+                SkillsDirectoryProvider(roots=Path.home() / ".claude" / "skills"),
+                MyProvider(),
+                SlowProvider(),
+            ],
+            timeout=0.5,
+        )
+    ],
+)
+
+
+### Component cache for custom providers
+
+""" A custom provider is asked for _list_tools, _list_resources and _list_prompts on every list,
+and the default _get_tool / _get_resource / _get_prompt call the list method again just to find one
+component. For a database or API backed provider every request becomes a query.
+
+CachedProviderMixin keeps the listed components and a name -> component index per component type:
+    cache_ttl: seconds before the cache is refreshed (None = never expires)
+    cache_version(): optional token reported by the provider (row count, etag, schema version...),
+        when the token changes the cache is refreshed
+    invalidate(): the provider calls it when it knows its source changed
+
+tools/call resolves the tool with one dictionary lookup, the list method is not called.
+
+Put the mixin first so it wraps the provider's own _list_* methods:
+    class CachedDictProvider(CachedProviderMixin, DictProvider): ...
+"""
+
+import time
+from collections.abc import Hashable
+
+from fastmcp.utilities.versions import version_sort_key
+
+
+def pick_version(candidates: list[Any], version: VersionSpec | None):
+    """Highest version among candidates that matches the spec (same rule as Provider._get_tool)."""
+    if version:
+        candidates = [c for c in candidates if version.matches(c.version)]
+    if not candidates:
+        return None
+    return max(candidates, key=version_sort_key)
+
+
+class CachedProviderMixin:
+    cache_ttl: float | None = None
+
+    async def cache_version(self) -> Hashable | None:
+        """Override to report a version token for the provider's source."""
+        return None
+
+    def invalidate(self, kind: str | None = None) -> None:
+        """Drop the cached components (all kinds, or only "tools"/"resources"/"templates"/"prompts")."""
+        cache = self.__dict__.setdefault("_component_cache", {})
+        if kind is None:
+            cache.clear()
+        else:
+            cache.pop(kind, None)
+
+    async def _cached(self, kind: str, load) -> tuple[Sequence[Any], dict[str, list[Any]]]:
+        cache = self.__dict__.setdefault("_component_cache", {})
+        version = await self.cache_version()
+        entry = cache.get(kind)
+        if entry is not None:
+            components, index, cached_version, loaded_at = entry
+            expired = self.cache_ttl is not None and time.monotonic() - loaded_at > self.cache_ttl
+            if not expired and cached_version == version:
+                return components, index
+
+        components = list(await load())
+        index: dict[str, list[Any]] = {}
+        for component in components:
+            identifier = str(component.uri) if isinstance(component, Resource) else getattr(component, "name", None)
+            index.setdefault(identifier, []).append(component)
+        cache[kind] = (components, index, version, time.monotonic())
+        return components, index
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        components, _ = await self._cached("tools", super()._list_tools)
+        return components
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        _, index = await self._cached("tools", super()._list_tools)
+        return pick_version(index.get(name, []), version)
+
+    async def _list_resources(self) -> Sequence[Resource]:
+        components, _ = await self._cached("resources", super()._list_resources)
+        return components
+
+    async def _get_resource(self, uri: str, version: VersionSpec | None = None) -> Resource | None:
+        _, index = await self._cached("resources", super()._list_resources)
+        return pick_version(index.get(uri, []), version)
+
+    async def _list_resource_templates(self) -> Sequence[ResourceTemplate]:
+        # Templates are matched by pattern, only the list is cached
+        components, _ = await self._cached("templates", super()._list_resource_templates)
+        return components
+
+    async def _list_prompts(self) -> Sequence[Prompt]:
+        components, _ = await self._cached("prompts", super()._list_prompts)
+        return components
+
+    async def _get_prompt(self, name: str, version: VersionSpec | None = None) -> Prompt | None:
+        _, index = await self._cached("prompts", super()._list_prompts)
+        return pick_version(index.get(name, []), version)
+
+
+class CachedDictProvider(CachedProviderMixin, DictProvider):
+    cache_ttl = 60
+
+    def add(self, name: str, func: Callable) -> None:
+        self._tools.append(Tool.from_function(func, name=name))
+        self.invalidate("tools")
+
+
+class CachedMyProvider(CachedProviderMixin, MyProvider):
+    """Database backed example, the schema version table tells when tools changed."""
+
+    async def cache_version(self) -> Hashable | None:
+        # e.g. SELECT version FROM schema_version
+        return 1
+
+
+mcp = FastMCP("Calculator", providers=[CachedDictProvider({"add": add, "multiply": multiply}), CachedMyProvider()])
+
+
+### Database backed provider (SQLite, paginated)
+
+""" DictProvider builds every Tool.from_function up front, fine for two tools, not for 100k generated ones.
+
+SQLiteToolProvider stores the tool definitions (name, description, schemas, handler) in SQLite:
+    tools/list is served page by page with keyset pagination (WHERE name > :cursor ORDER BY name LIMIT n),
+    only the rows of the requested page become Tool objects
+    A Tool object is built the first time the tool is called (primary key lookup)
+    Built tools are kept in a bounded LRU, memory stays flat with 100k+ tools
+
+The handler column names a Python callable registered on the provider, generated tools share a few
+handlers and differ only by their definition (e.g. one handler per backend API).
+
+PagedToolsServer passes the tools/list cursor down to the provider through a context variable,
+the page still goes through server.list_tools() so middleware, visibility and auth apply to it
+(a page can come back shorter than the page size when tools are filtered out).
+Tools from other providers would be repeated on every page, use a dedicated server.
+
+The MCP SDK keeps every listed tool definition for input validation and re-lists (page 1) when a
+called tool is not in it. PagedToolsServer bounds that cache (LRU) and fills a miss with get_tool
+for the one tool, which lands in the provider's LRU and serves the call right after.
+"""
+
+import base64
+import inspect
+import sqlite3
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import mcp.types as mcp_types
+from mcp.shared.exceptions import McpError
+
+from fastmcp import Client
+from fastmcp.tools.tool import ToolResult
+
+
+class StoredTool(Tool):
+    handler: str
+    _provider: Any = PrivateAttr(default=None)
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        result = self._provider.handlers[self.handler](self.name, arguments)
+        if inspect.isawaitable(result):
+            result = await result
+        return self.convert_result(result)
+
+
+@dataclass
+class ToolPage:
+    cursor: str | None
+    size: int
+    next_cursor: str | None = None
+
+
+# Set by PagedToolsServer for the duration of a tools/list request, a mutable holder so the
+# provider can hand the next cursor back even when providers are queried in separate tasks
+_tool_page: ContextVar[ToolPage | None] = ContextVar("_tool_page", default=None)
+
+
+class SQLiteToolProvider(Provider):
+    def __init__(self, db_path: str | Path, handlers: dict[str, Callable] | None = None, cache_size: int = 1024):
+        super().__init__()
+        self.handlers = dict(handlers or {})
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tools (
+                name TEXT PRIMARY KEY,
+                description TEXT,
+                parameters TEXT NOT NULL,
+                output_schema TEXT,
+                handler TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._cache: OrderedDict[str, StoredTool] = OrderedDict()
+        self._cache_size = cache_size
+
+    def add_tools(self, rows: Iterable[tuple[str, str, dict, dict | None, str]]) -> None:
+        """Insert or replace (name, description, parameters, output_schema, handler) rows."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tools VALUES (?, ?, ?, ?, ?)",
+                (
+                    (name, description, json.dumps(parameters), json.dumps(output_schema) if output_schema else None, handler)
+                    for name, description, parameters, output_schema, handler in rows
+                ),
+            )
+        self._cache.clear()
+
+    def _build(self, row: sqlite3.Row) -> StoredTool:
+        tool = StoredTool(
+            name=row["name"],
+            description=row["description"],
+            parameters=json.loads(row["parameters"]),
+            output_schema=json.loads(row["output_schema"]) if row["output_schema"] else None,
+            handler=row["handler"],
+        )
+        tool._provider = self
+        return tool
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        tool = self._cache.get(name)
+        if tool is not None:
+            self._cache.move_to_end(name)
+            return tool
+
+        row = self._db.execute("SELECT * FROM tools WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        tool = self._cache[name] = self._build(row)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return tool
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        page = _tool_page.get()
+        if page is None:
+            # Plain server.list_tools() outside a paginated request, builds every tool
+            return [self._build(row) for row in self._db.execute("SELECT * FROM tools ORDER BY name")]
+        rows, page.next_cursor = self._page_rows(page.cursor, page.size)
+        return [self._build(row) for row in rows]
+
+    async def get_tasks(self) -> Sequence[FastMCPComponent]:
+        # Stored tools never run as background tasks, do not list 100k tools at startup
+        return []
+
+    def _page_rows(self, cursor: str | None, limit: int) -> tuple[list[sqlite3.Row], str | None]:
+        try:
+            after = base64.urlsafe_b64decode(cursor).decode() if cursor else ""
+        except ValueError as e:
+            raise McpError(mcp_types.ErrorData(code=mcp_types.INVALID_PARAMS, message="Invalid cursor")) from e
+        rows = self._db.execute(
+            "SELECT * FROM tools WHERE name > ? ORDER BY name LIMIT ?",
+            (after, limit + 1),
+        ).fetchall()
+        next_cursor = base64.urlsafe_b64encode(rows[limit - 1]["name"].encode()).decode() if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+
+class ToolDefinitionCache(OrderedDict):
+    """Bounded replacement for the SDK's tool definition cache, least recently set goes first."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key: str, value: mcp_types.Tool) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class PagedToolsServer(FastMCP):
+    """FastMCP server whose tools/list pages are produced by the provider (keyset cursor)."""
+
+    def __init__(self, *args: Any, tools_page_size: int = 500, definition_cache_size: int = 1024, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.tools_page_size = tools_page_size
+        self._mcp_server._tool_cache = ToolDefinitionCache(definition_cache_size)
+        self._mcp_server._get_cached_tool_definition = self._tool_definition
+
+    async def _tool_definition(self, name: str) -> mcp_types.Tool | None:
+        # Replaces the SDK's lookup, which calls _list_tools_mcp(None) on a miss and re-lists page 1
+        cache = self._mcp_server._tool_cache
+        definition = cache.get(name)
+        if definition is None:
+            tool = await self.get_tool(name)
+            if tool is None:
+                return None
+            definition = cache[name] = tool.to_mcp_tool(name=tool.name)
+        return definition
+
+    async def _list_tools_mcp(self, request: mcp_types.ListToolsRequest) -> mcp_types.ListToolsResult:
+        if request is None:
+            # Only the SDK's cache refresh passes None, and _tool_definition replaced it
+            return mcp_types.ListToolsResult(tools=[])
+        cursor = request.params.cursor if request.params else None
+        page = ToolPage(cursor, self.tools_page_size)
+        token = _tool_page.set(page)
+        try:
+            tools = await self.list_tools()
+        finally:
+            _tool_page.reset(token)
+        return mcp_types.ListToolsResult(
+            tools=[tool.to_mcp_tool(name=tool.name) for tool in tools],
+            nextCursor=page.next_cursor,
+        )
+
+
+def call_backend(name: str, arguments: dict[str, Any]) -> dict:
+    return {"tool": name, "arguments": arguments}
+
+
+def create_tools_server(db_path: str | Path = "tools.db", page_size: int = 500) -> PagedToolsServer:
+    tool_db = SQLiteToolProvider(db_path, handlers={"backend": call_backend}, cache_size=1024)
+    return PagedToolsServer("GeneratedTools", providers=[tool_db], tools_page_size=page_size)
+
+# tools_mcp = create_tools_server("tools.db")
+
+
+# Benchmark: 100k tools, tools/list latency per page through the server and memory while paging
+# through all of them, then a call to a tool that is not on the listed pages
+
+async def benchmark_sqlite_pages(count: int = 100_000, page_size: int = 500) -> dict[str, float]:
+    provider = SQLiteToolProvider(":memory:", handlers={"backend": call_backend})
+    schema = {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]}
+    provider.add_tools((f"tool_{i:06d}", f"Generated tool {i}", schema, None, "backend") for i in range(count))
+    server = PagedToolsServer("Bench", providers=[provider], tools_page_size=page_size)
+
+    async with Client(server) as client:
+        tracemalloc.start()
+        latencies = []
+        cursor = None
+        while True:
+            start = time.perf_counter()
+            cursor = (await client.list_tools_mcp(cursor=cursor)).nextCursor
+            latencies.append(time.perf_counter() - start)
+            if cursor is None:
+                break
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        await client.call_tool(f"tool_{count // 2:06d}", {"query": "x"})
+        call_ms = (time.perf_counter() - start) * 1000
+
+    latencies.sort()
+    return {
+        "pages": len(latencies),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "peak_mb": peak / 1024 / 1024,
+        "sdk_cached_definitions": len(server._mcp_server._tool_cache),
+        "uncached_call_ms": call_ms,
+    }
+
+# asyncio.run(benchmark_sqlite_pages())
+
+
+### Pooled proxy provider
+
+""" ProxyProvider(ProxyClient(url).new) opens a fresh upstream session for every list and every call:
+TCP/TLS connect, initialize handshake, the request, then teardown. The upstream lists are fetched
+again on every tools/list, resources/list and prompts/list.
+
+PooledProxyProvider keeps a fixed number of upstream sessions open for the server's lifetime:
+    size: number of upstream sessions (bounded pool), opened in the provider lifespan with the
+        client's own async with lifecycle
+    A session whose call failed with a transport error, or that is no longer connected, is closed
+        and reopened when it is checked out next (the failed call itself is not retried)
+    max_in_flight: concurrent requests per session, MCP requests carry an id so one session
+        multiplexes many calls, callers wait for a free slot above that
+    The HTTP transport gets an httpx client with keep-alive limits, the TCP connections are reused
+    Upstream lists are cached (CachedProviderMixin) and dropped when the upstream sends
+        notifications/tools/list_changed, resources/list_changed or prompts/list_changed
+    With a ListChangedNotifier the change is forwarded to the proxy's own clients
+
+Sessions are shared by every client of the proxy, use it for stateless upstream tools, resources and
+prompts. Sampling, elicitation and progress forwarding need a session per client (ProxyProvider).
+"""
+
+from contextlib import AsyncExitStack, suppress
+from itertools import count
+
+import anyio
+import httpx
+
+from fastmcp.client import Client, StreamableHttpTransport
+from fastmcp.client.messages import MessageHandler
+from fastmcp.server.providers.proxy import ProxyClient, ProxyProvider
+
+
+def keep_alive_http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """httpx client for StreamableHttpTransport that keeps idle connections open."""
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=120)
+    return httpx.AsyncClient(limits=limits, **kwargs)
+
+
+def is_transport_error(error: BaseException | None) -> bool:
+    """True when the upstream session cannot be used anymore (closed stream, dropped connection)."""
+    if isinstance(error, McpError):
+        return error.error.code == mcp_types.CONNECTION_CLOSED
+    return isinstance(error, (httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError, ConnectionError))
+
+
+class PooledClient(ProxyClient):
+    """A ProxyClient kept connected by the pool, entering it only takes an in-flight slot."""
+
+    # None while the pool itself opens or closes the session
+    _slots: asyncio.Semaphore | None = None
+    broken: bool = False
+
+    async def __aenter__(self):
+        if self._slots is None:
+            return await super().__aenter__()
+        await self._slots.acquire()
+        try:
+            return await super().__aenter__()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._slots is None:
+            return await super().__aexit__(exc_type, exc_val, exc_tb)
+        if is_transport_error(exc_val):
+            self.broken = True
+        try:
+            await super().__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._slots.release()
+
+
+class UpstreamListChanged(MessageHandler):
+    def __init__(self, provider: "PooledProxyProvider"):
+        self._provider = provider
+
+    async def on_tool_list_changed(self, message: mcp_types.ToolListChangedNotification) -> None:
+        await self._provider.upstream_changed("tools")
+
+    async def on_resource_list_changed(self, message: mcp_types.ResourceListChangedNotification) -> None:
+        await self._provider.upstream_changed("resources", "templates")
+
+    async def on_prompt_list_changed(self, message: mcp_types.PromptListChangedNotification) -> None:
+        await self._provider.upstream_changed("prompts")
+
+
+class PooledProxyProvider(CachedProviderMixin, ProxyProvider):
+    def __init__(
+        self,
+        target: str | Client,
+        size: int = 4,
+        max_in_flight: int = 32,
+        notifier: ListChangedNotifier | None = None,
+    ):
+        if isinstance(target, str) and target.startswith(("http://", "https://")):
+            target = StreamableHttpTransport(target, httpx_client_factory=keep_alive_http_client)
+        self._template = PooledClient(target, message_handler=UpstreamListChanged(self))
+        self._size = size
+        self._max_in_flight = max_in_flight
+        self._notifier = notifier
+        self._clients: list[PooledClient] = []
+        # The pool's own hold on each session, same index as _clients
+        self._holds: list[AsyncExitStack] = []
+        self._reopen_lock = asyncio.Lock()
+        self._next = count()
+        super().__init__(self._checkout)
+
+    async def _checkout(self) -> Client:
+        if not self._clients:
+            raise RuntimeError("PooledProxyProvider is not running, add it to a server and start the server")
+        index = next(self._next) % len(self._clients)
+        client = self._clients[index]
+        if client.broken or not client.is_connected():
+            client = await self._reopen(index)
+        return client
+
+    async def _open(self) -> tuple[AsyncExitStack, PooledClient]:
+        client = self._template.new()
+        hold = AsyncExitStack()
+        await hold.enter_async_context(client)
+        client._slots = asyncio.Semaphore(self._max_in_flight)
+        # Runs first on close, the pool's exit does not give back a slot it never took
+        hold.callback(setattr, client, "_slots", None)
+        return hold, client
+
+    async def _reopen(self, index: int) -> PooledClient:
+        async with self._reopen_lock:
+            client = self._clients[index]
+            if not client.broken and client.is_connected():
+                return client  # already reopened by a concurrent checkout
+            logger.warning(f"Upstream session {index} of {self!r} is gone, reopening it")
+            with suppress(Exception):
+                await self._holds[index].aclose()
+            self._holds[index], self._clients[index] = await self._open()
+            return self._clients[index]
+
+    async def _close_all(self) -> None:
+        holds = list(self._holds)
+        self._holds.clear()
+        self._clients.clear()
+        for hold in holds:
+            with suppress(Exception):
+                await hold.aclose()
+
+    async def upstream_changed(self, *kinds: str) -> None:
+        for kind in kinds:
+            self.invalidate(kind)
+        if self._notifier is not None:
+            await self._notifier.broadcast()
+
+    @asynccontextmanager
+    async def lifespan(self):
+        async with AsyncExitStack() as stack:
+            stack.callback(self.invalidate)
+            stack.push_async_callback(self._close_all)
+            for _ in range(self._size):
+                hold, client = await self._open()
+                self._holds.append(hold)
+                self._clients.append(client)
+            yield
+
+    def __repr__(self) -> str:
+        return f"PooledProxyProvider(size={self._size}, max_in_flight={self._max_in_flight})"
+
+
+gateway_notifier = ListChangedNotifier()
+gateway = FastMCP("Gateway", providers=[PooledProxyProvider("http://localhost:8000/mcp", size=4, notifier=gateway_notifier)])
+gateway.add_middleware(gateway_notifier)
+
+
+# Benchmark: calls/sec direct to a local upstream, through ProxyProvider and through PooledProxyProvider
+
+async def benchmark_proxy(calls: int = 2000, concurrency: int = 50, port: int = 8765) -> dict[str, float]:
+    upstream = FastMCP("Upstream")
+
+    @upstream.tool
+    def echo(text: str) -> str:
+        return text
+
+    url = f"http://127.0.0.1:{port}/mcp"
+    server_task = asyncio.create_task(upstream.run_http_async(show_banner=False, host="127.0.0.1", port=port, log_level="warning"))
+    await asyncio.sleep(1)  # wait for uvicorn to bind
+
+    async def calls_per_second(client: Client) -> float:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with limit:
+                await client.call_tool("echo", {"text": f"hello {i}"})
+
+        await one(-1)  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        return calls / (time.perf_counter() - start)
+
+    targets = {
+        "direct": Client(url),
+        "proxy_per_call": Client(FastMCP("PerCall", providers=[ProxyProvider(ProxyClient(url).new)])),
+        "proxy_pooled": Client(FastMCP("Pooled", providers=[PooledProxyProvider(url, size=4)])),
+    }
+    results = {}
+    try:
+        for name, client in targets.items():
+            async with client:
+                results[name] = await calls_per_second(client)
+    finally:
+        server_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await server_task
+    return results
+
+# asyncio.run(benchmark_proxy())
+# proxy_per_call pays a connect + initialize per call, proxy_pooled should be close to direct
+
+
 #### Mounting servers
 
 """Mouting  allows to combine multiple FASTMCP servers into one,
@@ -341,3 +1704,306 @@ Parent Server tag filers apply recursively to mounted servers"
 """ When mounting multiple servers, with the same namespace the most recently mounted server 
 takes precedence for conflicting components names:"""
 
+
+
+### Routing table
+
+""" Resolving a tool is "first provider to return a matching tool wins", a call to a mounted or
+namespaced tool (weather_get_data, calendar_get_data) asks provider after provider.
+
+RoutingTableProvider keeps a merged routing table from the final key (post-transform name or URI)
+to the component returned by the provider that owns it. Dispatch is one dictionary lookup,
+no matter how many providers and mounted servers sit behind it.
+
+    Each provider is listed once and its routes are stored separately
+    The merged table follows registration order, the earlier provider wins a duplicate name
+    add_provider / remove_provider only list the provider that changed
+    Adding or removing a component on a LocalProvider (or a FastMCP server's own tools) registered
+        here invalidates that provider's routes automatically
+    Anything else, transforms, visibility changes, custom or remote providers whose components
+        change, needs invalidate(provider), providers have no in-process list changed signal
+    (FastMCP servers mounted through add_provider keep working, their tools route into the child)
+
+Resource templates are matched by pattern, they are not in the table and still use the normal lookup.
+"""
+
+ROUTED_KINDS = {
+    "tools": ("list_tools", lambda c: c.name),
+    "resources": ("list_resources", lambda c: str(c.uri)),
+    "prompts": ("list_prompts", lambda c: c.name),
+}
+
+
+def call_on_component_change(provider: Provider, callback: Callable[[], Any]) -> None:
+    """Run callback after a component is added to / removed from a LocalProvider or a server's own tools."""
+    local = provider._local_provider if isinstance(provider, FastMCP) else provider
+    if not isinstance(local, LocalProvider):
+        return
+    for method in ("_add_component", "_remove_component"):
+        original = getattr(local, method)
+
+        def changed(*args, _original=original, **kwargs):
+            result = _original(*args, **kwargs)
+            callback()
+            return result
+
+        setattr(local, method, changed)
+
+
+class RoutingTableProvider(AggregateProvider):
+    def __init__(self, providers: Sequence[Provider] | None = None):
+        super().__init__(providers)
+        # Routes of each registered provider: id(provider) -> kind -> key -> components (all versions)
+        self._provider_routes: dict[int, dict[str, dict[str, list[Any]]]] = {}
+        # What the caller registered -> the provider stored in self.providers (wrapped for mounts/namespaces)
+        self._registered: dict[int, Provider] = {}
+        self._routes: dict[str, dict[str, list[Any]]] | None = None
+        # Bumped by every change, a build that sees it move discards what it listed
+        self._generation = 0
+        self._build_lock = asyncio.Lock()
+        for provider in self.providers:
+            call_on_component_change(provider, lambda provider=provider: self.invalidate(provider))
+
+    def add_provider(self, provider: Provider, *, namespace: str = "") -> None:
+        super().add_provider(provider, namespace=namespace)
+        self._registered[id(provider)] = self.providers[-1]
+        self._generation += 1
+        self._routes = None
+        call_on_component_change(provider, lambda: self.invalidate(provider))
+
+    def remove_provider(self, provider: Provider) -> None:
+        registered = self._registered.pop(id(provider), provider)
+        self.providers.remove(registered)
+        self._provider_routes.pop(id(registered), None)
+        self._generation += 1
+        self._routes = None
+
+    def invalidate(self, provider: Provider | None = None) -> None:
+        if provider is None:
+            self._provider_routes.clear()
+        else:
+            registered = self._registered.get(id(provider), provider)
+            self._provider_routes.pop(id(registered), None)
+        self._generation += 1
+        self._routes = None
+
+    async def _list_routes(self, provider: Provider) -> dict[str, dict[str, list[Any]]]:
+        routes: dict[str, dict[str, list[Any]]] = {}
+        for kind, (method, route_key) in ROUTED_KINDS.items():
+            table: dict[str, list[Any]] = {}
+            try:
+                components = await getattr(provider, method)()
+            except Exception as e:
+                logger.debug(f"Error during {method} from provider {provider!r}: {e}")
+                components = []
+            for component in components:
+                table.setdefault(route_key(component), []).append(component)
+            routes[kind] = table
+        return routes
+
+    async def _get_routes(self) -> dict[str, dict[str, list[Any]]]:
+        routes = self._routes
+        if routes is not None:
+            return routes
+
+        async with self._build_lock:
+            while self._routes is None:
+                generation = self._generation
+                missing = [p for p in self.providers if id(p) not in self._provider_routes]
+                listed = await asyncio.gather(*map(self._list_routes, missing))
+                if generation != self._generation:
+                    # Invalidated while listing, the listed routes may already be stale
+                    continue
+                for provider, provider_routes in zip(missing, listed):
+                    self._provider_routes[id(provider)] = provider_routes
+
+                routes = {kind: {} for kind in ROUTED_KINDS}
+                for provider in self.providers:
+                    for kind, table in self._provider_routes[id(provider)].items():
+                        for key, components in table.items():
+                            routes[kind].setdefault(key, components)
+                self._routes = routes
+            return self._routes
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        return [c for components in (await self._get_routes())["tools"].values() for c in components]
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        return pick_version((await self._get_routes())["tools"].get(name, []), version)
+
+    async def _list_resources(self) -> Sequence[Resource]:
+        return [c for components in (await self._get_routes())["resources"].values() for c in components]
+
+    async def _get_resource(self, uri: str, version: VersionSpec | None = None) -> Resource | None:
+        return pick_version((await self._get_routes())["resources"].get(uri, []), version)
+
+    async def _list_prompts(self) -> Sequence[Prompt]:
+        return [c for components in (await self._get_routes())["prompts"].values() for c in components]
+
+    async def _get_prompt(self, name: str, version: VersionSpec | None = None) -> Prompt | None:
+        return pick_version((await self._get_routes())["prompts"].get(name, []), version)
+
+
+routing = RoutingTableProvider()
+routing.add_provider(weather, namespace="weather")
+routing.add_provider(calendar, namespace="calendar")
+
+main = FastMCP("Main", providers=[routing])
+# calendar_get_data -> one lookup in routing's table, weather is never asked
+
+
+### Direct dispatch for mounted servers
+
+""" main_server.mount(math_server) wraps every child tool in a FastMCPProviderTool.
+Calling it goes through the child's full call_tool pipeline: new Context, middleware chain,
+tool lookup again, telemetry span... and the same again at every mount level.
+
+DirectFastMCPProvider keeps the child's resolved tool and calls it directly:
+    Only middleware actually registered on a server in the chain runs (servers without middleware cost nothing)
+    Nested direct mounts are flattened, a tool mounted 5 levels deep is still called with one hop
+    The resolved tool is cached per mount level, later lookups do not walk down the chain again,
+        adding or removing a tool, enable() / disable() or add_transform() on any mounted server
+        of a direct mount chain clears the caches above it
+    Tools with auth checks and versioned lookups are never cached, they resolve through get_tool
+        every time; per-session visibility changes on a mounted child are not seen by cached tools,
+        call provider.invalidate() or mount with cache=False
+    Background task calls (task_meta) keep the normal delegated path
+
+The tool function sees the Context of the closest server that has middleware (or the top server),
+not a Context of each intermediate server.
+Combine it with RoutingTableProvider so the lookup is also independent of the mount depth.
+"""
+
+import weakref
+
+from fastmcp.server.context import Context
+from fastmcp.server.providers import FastMCPProvider
+from fastmcp.server.providers.fastmcp_provider import FastMCPProviderTool
+
+
+class DirectFastMCPTool(FastMCPProviderTool):
+    _target: Any = None
+    # (server, tool name in that server) for every server in the chain with middleware, outer -> inner
+    _middleware_chain: Any = None
+
+    @classmethod
+    def wrap(cls, server: Any, tool: Tool) -> "DirectFastMCPTool":
+        direct = super().wrap(server, tool)
+        if isinstance(tool, DirectFastMCPTool):
+            direct._target, chain = tool._target, tool._middleware_chain
+        else:
+            direct._target, chain = tool, []
+        direct._middleware_chain = [(server, tool.name), *chain] if server.middleware else chain
+        return direct
+
+    async def _run(self, arguments: dict[str, Any], task_meta=None):
+        if task_meta is not None:
+            return await super()._run(arguments, task_meta)
+        return await self.run(arguments)
+
+    async def run(self, arguments: dict[str, Any]):
+        return await self._invoke(arguments, 0)
+
+    async def _invoke(self, arguments: dict[str, Any], level: int):
+        if level == len(self._middleware_chain):
+            return await self._target._run(arguments)
+
+        server, name = self._middleware_chain[level]
+        async with Context(fastmcp=server) as ctx:
+            context = MiddlewareContext(
+                message=mcp_types.CallToolRequestParams(name=name, arguments=arguments),
+                source="client",
+                type="request",
+                method="tools/call",
+                fastmcp_context=ctx,
+            )
+            return await server._run_middleware(
+                context=context,
+                call_next=lambda context: self._invoke(context.message.arguments or {}, level + 1),
+            )
+
+
+# child server -> the direct providers that mount it somewhere
+_mounted_in: weakref.WeakKeyDictionary[FastMCP, list["DirectFastMCPProvider"]] = weakref.WeakKeyDictionary()
+
+
+class DirectFastMCPProvider(FastMCPProvider):
+    def __init__(self, server: FastMCP, parent: FastMCP | None = None, cache: bool = True):
+        super().__init__(server)
+        self.parent = parent
+        self.cache = cache
+        self._tools: dict[str, DirectFastMCPTool] = {}
+
+    def invalidate(self) -> None:
+        self._tools.clear()
+        # The servers above resolved through this one
+        for provider in _mounted_in.get(self.parent, []) if self.parent is not None else ():
+            provider.invalidate()
+
+    async def _list_tools(self) -> Sequence[Tool]:
+        return [DirectFastMCPTool.wrap(self.server, t) for t in await self.server.list_tools()]
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        if version is None and name in self._tools:
+            return self._tools[name]
+        tool = await self.server.get_tool(name, version)
+        if tool is None:
+            return None
+        direct = DirectFastMCPTool.wrap(self.server, tool)
+        # Auth is checked by the leaf server's get_tool, keep those on the slow path
+        if self.cache and version is None and direct._target.auth is None:
+            self._tools[name] = direct
+        return direct
+
+
+def call_on_transform_change(server: FastMCP, callback: Callable[[], Any]) -> None:
+    """Run callback after enable() / disable() / add_transform() on server (server-wide visibility)."""
+    for method in ("enable", "disable", "add_transform"):
+        original = getattr(server, method)
+
+        def changed(*args, _original=original, **kwargs):
+            result = _original(*args, **kwargs)
+            callback()
+            return result
+
+        setattr(server, method, changed)
+
+
+def mount_direct(parent: FastMCP, child: FastMCP, namespace: str = "", cache: bool = True) -> None:
+    provider = DirectFastMCPProvider(child, parent=parent, cache=cache)
+    _mounted_in.setdefault(child, []).append(provider)
+    call_on_component_change(child, provider.invalidate)
+    # A cached tool skips the child's get_tool, so its visibility rules must clear the cache
+    call_on_transform_change(child, provider.invalidate)
+    parent.add_provider(provider, namespace=namespace)
+
+
+# Benchmark: per-call overhead for mount depth 1-5
+
+async def benchmark_mount_depth(mount, max_depth: int = 5, calls: int = 2000) -> dict[int, float]:
+    """Microseconds per call of a tool mounted max_depth levels deep, for each depth."""
+    results = {}
+    for depth in range(1, max_depth + 1):
+        leaf = FastMCP("Leaf")
+
+        @leaf.tool
+        def add(x: int, y: int) -> int:
+            return x + y
+
+        top = leaf
+        for level in range(depth):
+            parent = FastMCP(f"Level{level}")
+            mount(parent, top)
+            top = parent
+
+        await top.call_tool("add", {"x": 1, "y": 2})  # warm up
+        start = time.perf_counter()
+        for _ in range(calls):
+            await top.call_tool("add", {"x": 1, "y": 2})
+        results[depth] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+# Compare both: mount() goes through every level's call_tool pipeline on each call, mount_direct
+# resolves through the levels on the first call only and then hits each level's cache
+# asyncio.run(benchmark_mount_depth(lambda parent, child: parent.mount(child)))
+# asyncio.run(benchmark_mount_depth(mount_direct))
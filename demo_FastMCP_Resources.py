@@ -277,4 +277,294 @@ def get_data_by_id(id: str) -> str:
        raise ValueError("Access to secure data is forbidden")
     elif id == "missing":
         raise ResourceError(f"Data with ID {id} not found")
-    return json.dumps({"id": id, "data": "Here is your data"})
\ No newline at end of file
+    return json.dumps({"id": id, "data": "Here is your data"})
+
+### Resource subscriptions
+
+""" Clients that watch a resource (data://config, dir://data-files) should not poll it with
+repeated resources/read calls. MCP lets a client send resources/subscribe for a URI and
+the server pushes notifications/resources/updated when the content changes.
+The client then reads the resource again only when it knows something changed.
+
+    File and directory resources: changes are detected by watching the filesystem (watchfiles)
+    Function resources: the code that changes the data calls subscriptions.notify(uri)
+
+Notifications are coalesced inside a debounce window, a burst of writes sends only one update per URI.
+"""
+
+import asyncio
+
+from mcp.server.lowlevel.server import request_ctx
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+from watchfiles import awatch
+
+from fastmcp.server.lifespan import lifespan
+
+
+class ResourceSubscriptions:
+    def __init__(self, debounce: float = 0.2):
+        self.debounce = debounce
+        self._subscribers: dict[str, set[ServerSession]] = {}
+        self._watched: dict[Path, str] = {}
+        self._pending: set[str] = set()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def install(self, server: FastMCP) -> None:
+        """Register the subscribe/unsubscribe handlers on the server."""
+        low_level = server._mcp_server
+
+        @low_level.subscribe_resource()
+        async def subscribe(uri: AnyUrl) -> None:
+            self._subscribers.setdefault(str(uri), set()).add(request_ctx.get().session)
+
+        @low_level.unsubscribe_resource()
+        async def unsubscribe(uri: AnyUrl) -> None:
+            self._subscribers.get(str(uri), set()).discard(request_ctx.get().session)
+
+        # The MCP SDK always advertises subscribe=False, tell clients we support it
+        get_capabilities = low_level.get_capabilities
+
+        def get_capabilities_with_subscribe(*args, **kwargs):
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        low_level.get_capabilities = get_capabilities_with_subscribe
+
+    def watch(self, path: Path, uri: str) -> None:
+        """Send updates for uri whenever the file or directory at path changes."""
+        self._watched[path.resolve()] = uri
+
+    def notify(self, uri: str) -> None:
+        """Mark uri as changed, the update is sent when the debounce window closes.
+
+        Must be called from the event loop (async tools/resources)."""
+        if uri not in self._subscribers:
+            return
+        self._pending.add(uri)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.debounce, lambda: loop.create_task(self._flush()))
+
+    async def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, set()
+        for uri in pending:
+            for session in list(self._subscribers.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception:
+                    # Session is gone, stop sending to it
+                    self._subscribers[uri].discard(session)
+
+    async def run_watcher(self) -> None:
+        if not self._watched:
+            return
+        # watchfiles already groups the raw events of a burst, notify() debounces per URI on top
+        async for changes in awatch(*self._watched, debounce=int(self.debounce * 1000)):
+            for _, changed_path in changes:
+                changed = Path(changed_path)
+                for watched_path, uri in self._watched.items():
+                    if changed == watched_path or watched_path in changed.parents:
+                        self.notify(uri)
+
+    @property
+    def lifespan(self):
+        """Lifespan that runs the filesystem watcher while the server is up."""
+
+        @lifespan
+        async def watcher_lifespan(server):
+            task = asyncio.create_task(self.run_watcher())
+            try:
+                yield {}
+            finally:
+                task.cancel()
+
+        return watcher_lifespan
+
+
+# Example
+
+subscriptions = ResourceSubscriptions(debounce=0.2)
+watched_mcp = FastMCP("Watched resources", lifespan=subscriptions.lifespan)
+subscriptions.install(watched_mcp)
+
+app_config = {"dark_theme": True, "version": "1.2.3"}
+
+@watched_mcp.resource("data://config")
+def get_watched_config() -> str:
+    return json.dumps(app_config)
+
+@watched_mcp.tool
+async def set_theme(dark_theme: bool) -> str:
+    app_config["dark_theme"] = dark_theme
+    # Function resources signal their own changes
+    subscriptions.notify("data://config")
+    return "Theme updated"
+
+# Directory resources are watched, any file written in ./data notifies dir://data-files subscribers
+if data_dir_path.exists() and data_dir_path.is_dir():
+    watched_mcp.add_resource(DirectoryResource(uri="dir://data-files", path=data_dir_path, name="Data Files"))
+    subscriptions.watch(data_dir_path, "dir://data-files")
+
+
+### Binary resources without extra copies
+
+""" Returning bytes from a resource function sends a BlobResourceContents.
+The bytes are read into memory, base64 encoded into a second bytes object, decoded into a str
+and then embedded in the JSON response. Large images and archives are copied several times.
+
+BinaryFileResource avoids the intermediate bytes copies:
+    The file is memory mapped, nothing is read into a bytes object
+    base64 is encoded chunk by chunk from the mapped buffer into one preallocated output buffer
+    Base64ResourceContent passes the encoded text straight through as the blob (no second encoding)
+
+For HTTP transport clients that can download outside the JSON-RPC envelope there is an opt-in
+raw download URL (mcp.custom_route + FileResponse, the file is sent with sendfile, no base64 at all).
+The URL is published in the content meta as "rawDownloadUrl". Downloads are registered per server
+under a hash of the resource URI, and the route applies the server's bearer auth and the
+resource's own auth checks, like a resources/read would.
+"""
+
+import binascii
+import hashlib
+import os
+import weakref
+import mmap
+import tracemalloc
+
+import mcp.types as mcp_types
+from mcp.server.auth.middleware.bearer_auth import AuthenticatedUser
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+from fastmcp.exceptions import AuthorizationError
+from fastmcp.resources import Resource, ResourceContent, ResourceResult
+from fastmcp.server.auth.authorization import AuthContext, run_auth_checks
+
+# Multiple of 3 so every chunk encodes without padding
+B64_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def b64encode_file(path: Path) -> str:
+    """Base64 encode a file straight from a memory map into a single output buffer."""
+    size = path.stat().st_size
+    if size == 0:
+        return ""
+    out = bytearray(4 * ((size + 2) // 3))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        pos = 0
+        for start in range(0, size, B64_CHUNK_SIZE):
+            encoded = binascii.b2a_base64(view[start:start + B64_CHUNK_SIZE], newline=False)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+        view.release()
+    return out.decode("ascii")
+
+
+class Base64ResourceContent(ResourceContent):
+    """Content that is already base64 text, sent as a blob without encoding it again."""
+
+    def to_mcp_resource_contents(self, uri):
+        return mcp_types.BlobResourceContents(
+            uri=uri,
+            blob=self.content,
+            mimeType=self.mime_type or "application/octet-stream",
+            _meta=self.meta,
+        )
+
+
+# server -> download id -> resource
+raw_downloads: weakref.WeakKeyDictionary[FastMCP, dict[str, "BinaryFileResource"]] = weakref.WeakKeyDictionary()
+
+
+def raw_download_id(uri: str) -> str:
+    return hashlib.sha256(uri.encode()).hexdigest()[:32]
+
+
+class BinaryFileResource(Resource):
+    path: Path
+    mime_type: str = "application/octet-stream"
+    raw_download_url: str | None = None
+
+    async def read(self) -> ResourceResult:
+        try:
+            encoded = await asyncio.to_thread(b64encode_file, self.path)
+        except OSError as e:
+            raise ResourceError(f"Error reading file {self.path}") from e
+        meta = {"rawDownloadUrl": self.raw_download_url} if self.raw_download_url else None
+        return ResourceResult([Base64ResourceContent(encoded, mime_type=self.mime_type, meta=meta)])
+
+
+def add_binary_file(server: FastMCP, uri: str, path: Path, mime_type: str, raw_base_url: str | None = None):
+    """Register a binary file resource, optionally also downloadable over plain HTTP."""
+    raw_download_url = None
+    if raw_base_url is not None:
+        raw_download_url = f"{raw_base_url.rstrip('/')}/raw/{raw_download_id(uri)}"
+    resource = BinaryFileResource(
+        uri=uri, name=path.name, path=path, mime_type=mime_type, raw_download_url=raw_download_url
+    )
+    server.add_resource(resource)
+    if raw_download_url is not None:
+        raw_downloads.setdefault(server, {})[raw_download_id(uri)] = resource
+
+
+def enable_raw_downloads(server: FastMCP) -> None:
+    @server.custom_route("/raw/{download_id}", methods=["GET"])
+    async def raw_download(request: Request) -> Response:
+        resource = raw_downloads.get(server, {}).get(request.path_params["download_id"])
+        if resource is None:
+            return Response(status_code=404)
+        # custom routes are outside RequireAuthMiddleware, check the token here
+        user = request.scope.get("user")
+        token = user.access_token if isinstance(user, AuthenticatedUser) else None
+        if server.auth is not None and token is None:
+            return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+        if resource.auth is not None:
+            try:
+                allowed = run_auth_checks(resource.auth, AuthContext(token=token, component=resource))
+            except AuthorizationError:
+                allowed = False
+            if not allowed:
+                return Response(status_code=403)
+        return FileResponse(resource.path, media_type=resource.mime_type)
+
+
+binary_mcp = FastMCP("Binary resources")
+enable_raw_downloads(binary_mcp)
+
+logo_path = Path("./data/logo.png").resolve()
+if logo_path.exists():
+    add_binary_file(binary_mcp, "image://logo", logo_path, "image/png", raw_base_url="http://localhost:8000")
+
+
+# Measuring allocations per MB served
+
+def allocated_mb_per_mb(read, size_mb: int = 32) -> float:
+    """Peak traced allocation of one read divided by the file size."""
+    sample = Path("./data/sample.bin").resolve()
+    sample.parent.mkdir(exist_ok=True)
+    sample.write_bytes(os.urandom(size_mb * 1024 * 1024))
+    try:
+        tracemalloc.start()
+        read(sample)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        sample.unlink()
+    return peak / (size_mb * 1024 * 1024)
+
+
+def read_as_bytes_blob(path: Path) -> str:
+    # What a bytes-returning resource does: read, encode, decode
+    return ResourceContent(path.read_bytes()).to_mcp_resource_contents("data://sample").blob
+
+
+def read_as_mapped_blob(path: Path) -> str:
+    return Base64ResourceContent(b64encode_file(path)).to_mcp_resource_contents("data://sample").blob
+
+# allocated_mb_per_mb(read_as_bytes_blob)   ~3.7 (bytes + base64 bytes + str)
+# allocated_mb_per_mb(read_as_mapped_blob)  ~2.7 (output buffer + str)
@@ -84,6 +84,170 @@ await progress.set_message(text)
 
 
 """
+### Process pool tasks
+
+"""
+long_running_operation and process_files run on the server's event loop, a CPU-bound loop there
+stalls every other session until it returns.
+
+ProcessPoolTasks runs plain sync functions as background tasks in worker processes:
+    cpu_tasks.task(fn) wraps fn, register the wrapper with task=TaskConfig(...) as usual
+    A parameter annotated WorkerProgress (set_total / increment / set_message, same names as
+        Progress) gets a worker-side progress, updates are batched in the worker and replayed on the
+        task's Progress() every flush_interval; functions without one get no progress parameter
+    Each task runs in its own spawned process, at most max_workers at a time (os.cpu_count() by
+        default), so cancelling the task terminates its process right away
+    The processes live in the server lifespan, the ones still running are terminated on shutdown
+fn and its arguments are pickled to the worker, which imports fn by module name: fn must be a
+module level function of an importable module, the worker functions are in demo_FastMCP_Workers.
+Starting a process per task costs tens of milliseconds, meant for tasks that run for seconds.
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+import time
+from typing import Any, Callable
+
+from demo_FastMCP_Workers import WorkerProgress, busy, count_primes, run_in_worker
+from fastmcp.server.lifespan import Lifespan
+
+
+def _receive(connection, timeout: float) -> list[tuple[str, Any]]:
+    """Messages sent by the worker within timeout, ("exited", None) once it closed the pipe."""
+    received = []
+    try:
+        if connection.poll(timeout):
+            received.append(connection.recv())
+            while connection.poll():
+                received.append(connection.recv())
+    except EOFError:
+        received.append(("exited", None))
+    return received
+
+
+class ProcessPoolTasks:
+    def __init__(self, max_workers: int | None = None, flush_interval: float = 0.1):
+        self.max_workers = max_workers or os.cpu_count()
+        self.flush_interval = flush_interval
+        self.lifespan = Lifespan(self._lifespan)
+        self._context = None
+        self._slots: asyncio.Semaphore | None = None
+        self._processes: set = set()
+
+    async def _lifespan(self, server):
+        # spawn, the server process already runs threads
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(self.max_workers)
+        try:
+            yield {"process_pool": self}
+        finally:
+            for process in list(self._processes):
+                process.terminate()
+            self._context = self._slots = None
+
+    def task(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+        progress_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is WorkerProgress), None
+        )
+        parameters = list(signature.parameters.values())
+        if progress_param is not None:
+            # The registered function gets the task's Progress under the same name
+            parameters = [p for p in parameters if p.name != progress_param]
+            parameters.append(
+                inspect.Parameter(progress_param, inspect.Parameter.KEYWORD_ONLY, default=Progress(), annotation=Progress)
+            )
+
+        async def run(**kwargs):
+            progress = kwargs.pop(progress_param) if progress_param is not None else None
+            return await self.run(fn, kwargs, progress_param, progress)
+
+        run.__name__, run.__qualname__, run.__doc__ = fn.__name__, fn.__qualname__, fn.__doc__
+        run.__signature__ = signature.replace(parameters=parameters)
+        run.__annotations__ = {p.name: p.annotation for p in parameters if p.annotation is not p.empty}
+        if signature.return_annotation is not signature.empty:
+            run.__annotations__["return"] = signature.return_annotation
+        return run
+
+    async def run(self, fn, kwargs, progress_param=None, progress=None):
+        if self._context is None:
+            raise RuntimeError("ProcessPoolTasks.lifespan is not running")
+        async with self._slots:
+            receiver, sender = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=run_in_worker, args=(fn, kwargs, progress_param, sender, self.flush_interval), daemon=True
+            )
+            process.start()
+            sender.close()  # the worker holds the only write end, recv() raises EOFError when it exits
+            self._processes.add(process)
+            try:
+                while True:
+                    for kind, value in await asyncio.to_thread(_receive, receiver, self.flush_interval):
+                        if kind == "result":
+                            return value
+                        if kind == "error":
+                            raise value
+                        if kind == "exited":
+                            await asyncio.to_thread(process.join)
+                            raise RuntimeError(f"Worker running {fn.__name__} exited with code {process.exitcode}")
+                        await getattr(progress, kind)(value)
+            finally:
+                # cancelled (or the server stopped): terminate the worker instead of letting it run on
+                if process.is_alive():
+                    process.terminate()
+                self._processes.discard(process)
+                await asyncio.to_thread(process.join)
+
+
+cpu_tasks = ProcessPoolTasks()
+mcp = FastMCP("CPU tasks", lifespan=cpu_tasks.lifespan)
+mcp.tool(cpu_tasks.task(count_primes), task=TaskConfig(mode="required"))
+
+
+# Benchmark: event loop lag while CPU-bound jobs run inline on the loop vs in worker processes
+
+async def benchmark_process_pool(jobs: int = 8, n: int = 3_000_000) -> dict[str, float]:
+    async def max_lag(work) -> tuple[float, float]:
+        lag, stop = 0.0, asyncio.Event()
+
+        async def ticker():
+            nonlocal lag
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lag = max(lag, time.perf_counter() - start - 0.01)
+
+        tick = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        await work()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick
+        return elapsed, lag
+
+    async def inline():
+        for _ in range(jobs):
+            busy(n)
+
+    tasks = ProcessPoolTasks()
+    async with tasks.lifespan(None):
+
+        async def pooled():
+            # includes starting one process per job
+            await asyncio.gather(*(tasks.run(busy, {"n": n}) for _ in range(jobs)))
+
+        results = {}
+        for label, work in (("inline", inline), ("pool", pooled)):
+            elapsed, lag = await max_lag(work)
+            results[f"{label}_total_s"] = elapsed
+            results[f"{label}_max_loop_lag_ms"] = lag * 1000
+    return results
+
+# asyncio.run(benchmark_process_pool())
+
 ### Dependency Injection
 # Inject runtime values like HTTP requests, access tokens, and custom dependencies into your MCP components.
 
@@ -144,6 +308,174 @@ Lifespans are defined using the @mcp.lifespan decorator. You can specify setup a
 "so you create a lifespan to manage the connection."
 ""
 
+"""Resource pools
+
+Without a pool every tool call opens its own database connection (or loads its own model), the
+lifespan is where those should be created once and shared.
+
+ResourcePool(name, create, close=..., max_size=..., warmup=...):
+    pool.lifespan creates warmup instances at startup and closes everything at shutdown,
+        pools compose like any lifespan: lifespan=db_pool.lifespan | model_pool.lifespan
+    Tools take an instance with Depends(pool.checkout), it goes back to the pool when the call ends
+        (closed instead when the call raised one of discard_on)
+    At most max_size instances exist, extra calls wait up to acquire_timeout seconds
+    pool.stats() reports idle / in use / created / checkouts / waits / discarded
+create and close may be sync or async.
+"""
+
+import json
+import sqlite3
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Generic, TypeVar
+
+from fastmcp import Client
+from fastmcp.dependencies import Depends
+
+T = TypeVar("T")
+
+
+class ResourcePool(Generic[T]):
+    def __init__(
+        self,
+        name: str,
+        create: Callable[[], T | Awaitable[T]],
+        *,
+        close: Callable[[T], Any] | None = None,
+        max_size: int = 10,
+        warmup: int = 0,
+        acquire_timeout: float = 30.0,
+        discard_on: tuple[type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.warmup = min(warmup, max_size)
+        self.acquire_timeout = acquire_timeout
+        self.discard_on = discard_on
+        self.lifespan = Lifespan(self._lifespan)
+        self._create_instance = create
+        self._close_instance = close
+        self._idle: deque[T] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._running = False
+        self._in_use = 0
+        self.created = self.checkouts = self.waits = self.discarded = 0
+
+    async def _create(self) -> T:
+        instance = self._create_instance()
+        if inspect.isawaitable(instance):
+            instance = await instance
+        self.created += 1
+        return instance
+
+    async def _close(self, instance: T) -> None:
+        if self._close_instance is not None:
+            result = self._close_instance(instance)
+            if inspect.isawaitable(result):
+                await result
+
+    async def start(self) -> None:
+        self._idle.extend(await asyncio.gather(*(self._create() for _ in range(self.warmup))))
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+        while self._idle:
+            await self._close(self._idle.pop())
+
+    async def _lifespan(self, server):
+        await self.start()
+        try:
+            yield {self.name: self}
+        finally:
+            await self.stop()
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[T]:
+        if not self._running:
+            raise RuntimeError(f"Pool {self.name!r} is not running, add its lifespan to the server")
+        if self._slots.locked():
+            self.waits += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+            except TimeoutError:
+                raise TimeoutError(f"No {self.name!r} instance free within {self.acquire_timeout}s") from None
+        else:
+            await self._slots.acquire()
+        try:
+            instance = self._idle.pop() if self._idle else await self._create()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._in_use += 1
+        self.checkouts += 1
+        discard = False
+        try:
+            yield instance
+        except self.discard_on:
+            discard = True
+            raise
+        finally:
+            self._in_use -= 1
+            if discard or not self._running:
+                self.discarded += discard
+                await self._close(instance)
+            else:
+                self._idle.append(instance)
+            self._slots.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self.created,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "discarded": self.discarded,
+        }
+
+
+# In-memory SQLite as the database, every pooled connection sees the same shared database
+def open_connection() -> sqlite3.Connection:
+    connection = sqlite3.connect("file:notes?mode=memory&cache=shared", uri=True, check_same_thread=False)
+    connection.execute("CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, text TEXT NOT NULL)")
+    return connection
+
+
+db_pool = ResourcePool("db", open_connection, close=sqlite3.Connection.close, max_size=4, warmup=2,
+                       discard_on=(sqlite3.DatabaseError,))
+mcp = FastMCP("Pooled notes", lifespan=db_pool.lifespan)
+
+@mcp.tool
+async def add_note(text: str, db: sqlite3.Connection = Depends(db_pool.checkout)) -> int:
+    cursor = db.execute("INSERT INTO notes (text) VALUES (?)", (text,))
+    db.commit()
+    return cursor.lastrowid
+
+@mcp.tool
+async def search_notes(query: str, db: sqlite3.Connection = Depends(db_pool.checkout)) -> list[str]:
+    rows = db.execute("SELECT text FROM notes WHERE text LIKE ?", (f"%{query}%",)).fetchall()
+    return [text for (text,) in rows]
+
+@mcp.resource("stats://pools")
+def pool_stats() -> str:
+    return json.dumps({db_pool.name: db_pool.stats()})
+
+
+# Example run: many concurrent calls share at most max_size connections
+
+async def run_pooled_notes(calls: int = 200) -> dict[str, int]:
+    async with Client(mcp) as client:
+        await asyncio.gather(*(client.call_tool("add_note", {"text": f"note {i}"}) for i in range(calls)))
+        found = await client.call_tool("search_notes", {"query": "note"})
+        assert len(found.data) == calls
+    stats = db_pool.stats()
+    assert stats["created"] - stats["discarded"] <= db_pool.max_size and stats["in_use"] == 0
+    return stats
+
+# asyncio.run(run_pooled_notes())
+
 ### MIddleWare
 
 """ Middleware allows you to intercept and modify requests and responses as they pass through the FastMCP server.
@@ -176,6 +508,192 @@ parent.mount(child, namespace="child")
 
 """ FastMCP includes production ready middleware for logging, authentication, rate limiting, and more."""
 
+"""Buffered structured logging
+
+LoggingMiddleware above prints twice per request on the event loop, StructuredLoggingMiddleware
+formats JSON and calls the logging handlers inline too, under load that I/O lands in the tail
+latency of every request.
+
+BufferedLoggingMiddleware keeps the StructuredLoggingMiddleware records but only appends them to
+an in-memory deque on the request path (append/popleft need no lock):
+    A background task flushes batches of batch_size, or every flush_interval seconds, JSON
+        formatting and the logging handlers run in a worker thread
+    A full queue drops the new record and counts it, requests never wait on the log
+    sample_rate keeps that fraction of the start/success records, errors are always kept
+    stats() reports queued / flushed / dropped / sampled_out
+Add middleware.lifespan to the server (or await close()) to flush what is left at shutdown.
+"""
+
+import logging
+import random
+import statistics
+import tempfile
+from pathlib import Path
+
+from fastmcp.server.middleware.logging import StructuredLoggingMiddleware
+
+
+class BufferedLoggingMiddleware(StructuredLoggingMiddleware):
+    def __init__(
+        self,
+        *,
+        max_queue: int = 100_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        sample_rate: float = 1.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.lifespan = Lifespan(self._lifespan)
+        self._queue: deque[tuple[int, dict[str, Any]]] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        self.flushed = self.dropped = self.sampled_out = 0
+
+    def _log_message(self, message: dict[str, Any], log_level: int | None = None) -> None:
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        message["timestamp"] = time.time()
+        self._queue.append((log_level or self.log_level, message))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def on_message(self, context: MiddlewareContext, call_next):
+        if self.methods and context.method not in self.methods:
+            return await call_next(context)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        if sampled:
+            self._log_message(self._create_before_message(context))
+        else:
+            self.sampled_out += 1
+        start_time = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception as e:
+            self._log_message(self._create_error_message(context, start_time, e), logging.ERROR)
+            raise
+        if sampled:
+            self._log_message(self._create_after_message(context, start_time))
+        return result
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                await asyncio.to_thread(self._write, batch)
+                self.flushed += len(batch)
+
+    def _write(self, batch: list[tuple[int, dict[str, Any]]]) -> None:
+        for level, message in batch:
+            self.logger.log(level, self._format_message(message))
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    async def _lifespan(self, server):
+        try:
+            yield {}
+        finally:
+            await self.close()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+        }
+
+
+buffered_logging = BufferedLoggingMiddleware(sample_rate=0.25)
+mcp = FastMCP("MyServer", lifespan=buffered_logging.lifespan)
+mcp.add_middleware(buffered_logging)
+
+
+# Benchmark: p50/p99 tool call latency at a fixed concurrency, logging to a file, repeated runs
+
+async def benchmark_logging(calls: int = 20_000, concurrency: int = 100, repeats: int = 5) -> dict[str, float]:
+    handler = logging.FileHandler(Path(tempfile.mkdtemp()) / "requests.log")
+
+    def file_logger(name: str) -> logging.Logger:
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        return logger
+
+    async def latencies(middleware: Middleware | None) -> list[float]:
+        server = FastMCP("Logging benchmark")
+
+        @server.tool
+        async def echo(text: str) -> str:
+            return text
+
+        if middleware is not None:
+            server.add_middleware(middleware)
+        await server.call_tool("echo", {"text": "warm up"})
+        timings = []
+
+        async def worker(first: int) -> None:
+            # concurrency workers calling back to back, no queue of pending coroutines in the timings
+            for i in range(first, calls, concurrency):
+                start = time.perf_counter()
+                await server.call_tool("echo", {"text": f"request {i}"})
+                timings.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(worker(first) for first in range(concurrency)))
+        if isinstance(middleware, BufferedLoggingMiddleware):
+            await middleware.close()
+        return timings
+
+    setups = {
+        "none": lambda: None,
+        "structured": lambda: StructuredLoggingMiddleware(logger=file_logger("bench.structured")),
+        "buffered": lambda: BufferedLoggingMiddleware(logger=file_logger("bench.buffered")),
+        "buffered_sampled": lambda: BufferedLoggingMiddleware(logger=file_logger("bench.sampled"), sample_rate=0.1),
+    }
+    runs: dict[str, list[float]] = {}
+    for _ in range(repeats):
+        # every setup once per round, drift over time hits all of them alike
+        for label, make in setups.items():
+            cuts = statistics.quantiles(await latencies(make()), n=100)
+            runs.setdefault(f"{label}_p50_ms", []).append(cuts[49])
+            runs.setdefault(f"{label}_p99_ms", []).append(cuts[98])
+    handler.close()
+
+    results = {key: statistics.median(values) for key, values in runs.items()}
+    for cut in ("p50", "p99"):
+        # paired per round, compare the min/max spread with the median difference
+        differences = [s - b for s, b in zip(runs[f"structured_{cut}_ms"], runs[f"buffered_{cut}_ms"])]
+        results[f"structured_minus_buffered_{cut}_ms"] = statistics.median(differences)
+        results[f"structured_minus_buffered_{cut}_min_ms"] = min(differences)
+        results[f"structured_minus_buffered_{cut}_max_ms"] = max(differences)
+    return results
+
+# asyncio.run(benchmark_logging())
+# The buffered gain is the structured_minus_buffered_* median, a min below 0 means it is within noise
+
 # Pagination
 
 """ 
@@ -206,6 +724,173 @@ Absolute: steps by completed/total
 Indeterminate= no specific progress, just activity
 """
 
+"""Throttled progress
+
+long_running_operation reports every step and process_files increments once per file, 100k files
+are 100k notifications on the wire, the tool waits on each send and the client redraws each one.
+
+ProgressThrottle sits in front of a report_progress style callable:
+    An update goes out when min_interval seconds passed or progress moved by min_delta (fraction
+        of total) since the last one, whichever comes first, set either to None to disable it
+    The first update and the final one (progress >= total) always go out immediately
+    Skipped updates are not lost, the next send carries the latest value and message, flush()
+        (or leaving the async with) sends whatever is still pending
+ThrottledProgress wraps a Progress() dependency the same way, the task's Docket progress (and the
+notifications/tasks/status it triggers) only sees the batched increments.
+"""
+
+from typing import Awaitable, Literal
+
+from fastmcp import Client
+
+
+class ProgressThrottle:
+    def __init__(
+        self,
+        send: Callable[[float, float | None, str | None], Awaitable[None]],
+        min_interval: float | None = 0.25,
+        min_delta: float | None = None,
+    ):
+        self._send = send
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self._latest: tuple[float, float | None, str | None] | None = None
+        self._sent: tuple[float, float | None, str | None] | None = None
+        self._sent_at = 0.0
+        self.sent = 0
+        self.skipped = 0
+
+    async def __aenter__(self) -> "ProgressThrottle":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.flush()
+
+    async def report(self, progress: float, total: float | None = None, message: str | None = None) -> None:
+        self._latest = (progress, total, message)
+        now = time.monotonic()
+        if self._sent is None or (total is not None and progress >= total) or self._due(progress, total, now):
+            await self._send_latest(now)
+        else:
+            self.skipped += 1
+
+    def _due(self, progress: float, total: float | None, now: float) -> bool:
+        if self.min_interval is not None and now - self._sent_at >= self.min_interval:
+            return True
+        return self.min_delta is not None and bool(total) and (progress - self._sent[0]) / total >= self.min_delta
+
+    async def _send_latest(self, now: float | None = None) -> None:
+        self._sent, self._sent_at = self._latest, now or time.monotonic()
+        self.sent += 1
+        await self._send(*self._latest)
+
+    async def flush(self) -> None:
+        if self._latest is not None and self._latest != self._sent:
+            await self._send_latest()
+
+
+class ThrottledProgress:
+    def __init__(self, progress, min_interval: float | None = 0.25, min_delta: float | None = None):
+        self._progress = progress
+        self._current = progress.current or 0
+        self._message = progress.message
+        self._throttle = ProgressThrottle(self._forward, min_interval, min_delta)
+
+    async def __aenter__(self) -> "ThrottledProgress":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self._throttle.flush()
+
+    @property
+    def current(self) -> int | None:
+        return self._current
+
+    @property
+    def total(self) -> int:
+        return self._progress.total
+
+    @property
+    def message(self) -> str | None:
+        return self._message
+
+    async def set_total(self, total: int) -> None:
+        await self._progress.set_total(total)
+
+    async def increment(self, amount: int = 1) -> None:
+        self._current += amount
+        await self._throttle.report(self._current, self.total, self._message)
+
+    async def set_message(self, message: str | None) -> None:
+        self._message = message
+        await self._throttle.report(self._current, self.total, message)
+
+    async def _forward(self, current: float, total: float | None, message: str | None) -> None:
+        if message != self._progress.message:
+            await self._progress.set_message(message)
+        sent = self._progress.current or 0
+        if current > sent:
+            await self._progress.increment(current - sent)
+
+
+mcp = FastMCP("Throttled progress")
+
+@mcp.tool(task=True)
+async def process_many_files(files: list[str], progress: Progress = Progress()) -> str:
+    await progress.set_total(len(files))
+    async with ThrottledProgress(progress, min_interval=0.5, min_delta=0.01) as throttled:
+        for file in files:
+            await throttled.set_message(f"Processing {file}")
+            # ... do work ...
+            await throttled.increment()
+    return f"Processed {len(files)} files"
+
+@mcp.tool
+async def long_running_steps(steps: int, ctx: Context) -> str:
+    async with ProgressThrottle(ctx.report_progress, min_interval=0.5) as throttle:
+        for step in range(steps):
+            # ... do work ...
+            await throttle.report(step + 1, steps, f"Step {step + 1} of {steps} completed")
+    return f"Completed {steps} steps"
+
+
+# Benchmark: a tight loop over an in-memory client session, no progress vs every step vs throttled
+
+async def benchmark_progress(steps: int = 100_000, min_interval: float = 0.1) -> dict[str, float]:
+    bench = FastMCP("Progress benchmark")
+
+    @bench.tool
+    async def tight_loop(steps: int, mode: Literal["none", "every_step", "throttled"], ctx: Context) -> int:
+        if mode == "every_step":
+            for step in range(steps):
+                await ctx.report_progress(step + 1, steps)
+        elif mode == "throttled":
+            async with ProgressThrottle(ctx.report_progress, min_interval=min_interval) as throttle:
+                for step in range(steps):
+                    await throttle.report(step + 1, steps)
+        else:
+            for step in range(steps):
+                pass
+        return steps
+
+    received = 0
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        nonlocal received
+        received += 1
+
+    results = {}
+    async with Client(bench, progress_handler=on_progress) as client:
+        for mode in ("none", "every_step", "throttled"):
+            received = 0
+            start = time.perf_counter()
+            await client.call_tool("tight_loop", {"steps": steps, "mode": mode})
+            results[f"{mode}_ms"] = (time.perf_counter() - start) * 1000
+            results[f"{mode}_notifications"] = received
+    return results
+
+# asyncio.run(benchmark_progress())
+
 ### Samplig
 
 """ A tool can call a llm with sampling parameters to get varied outputs.
@@ -218,4 +903,343 @@ Usuario → LLM → Tool → (Tool llama OTRO LLM) → Resultado
 
 ### Storage Backend
 
-""" FastMCP supports various storage backends to persist data such as tool definitions, user sessions, and logs."""
\ No newline at end of file
+""" FastMCP supports various storage backends to persist data such as tool definitions, user sessions, and logs."""
+
+"""SQLite task store
+
+Background task state lives in Docket (Redis, or memory:// in-process), an in-memory setup loses
+every task on restart and nothing bounds what it keeps.
+
+SQLiteTaskStore keeps task status, progress and results in a local SQLite file:
+    WAL mode, readers never block the writer, several server processes can share one file
+        (each opens its own connection, concurrent writers wait on the busy timeout)
+    Age based eviction (ttl per task) and size based eviction (max_bytes, oldest finished tasks first)
+    Results of compress_threshold bytes or more are stored zlib compressed
+    All SQLite calls run on one background thread, the event loop never waits on the disk
+    Records are keyed by (session_id, task_id), a session reusing a task id never touches another
+        session's record
+    The thread and the connection live in the server lifespan (lifespan=store.lifespan)
+
+store.persist(fn) records a task=TaskConfig(mode="required") tool under its session and MCP task id,
+status, result and final progress always, Progress() updates at most every progress_interval seconds.
+The tasks://{task_id} resource reads the record back as JSON, also after a restart, only for the
+session that started the task (like Docket's task keys).
+"""
+
+import json
+import sqlite3
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+import pydantic_core
+from docket.dependencies import TaskKey
+
+from fastmcp.exceptions import NotFoundError
+from fastmcp.server.tasks.keys import parse_task_key
+
+TASK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    session_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL,
+    total REAL,
+    message TEXT,
+    result BLOB,
+    compressed INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (session_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_expires_at ON tasks (expires_at);
+CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at);
+"""
+
+
+@dataclass
+class TaskRecord:
+    task_id: str
+    session_id: str
+    status: str
+    progress: float | None
+    total: float | None
+    message: str | None
+    result: Any
+    created_at: float
+    updated_at: float
+
+
+class SQLiteTaskStore:
+    def __init__(
+        self,
+        path: str | os.PathLike = "tasks.sqlite3",
+        *,
+        ttl: timedelta = timedelta(days=1),
+        max_bytes: int = 256 * 1024 * 1024,
+        compress_threshold: int = 64 * 1024,
+        evict_every: int = 100,
+        progress_interval: float = 1.0,
+    ):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_threshold = compress_threshold
+        self.evict_every = evict_every
+        self.progress_interval = progress_interval
+        self.lifespan = Lifespan(self._lifespan)
+        # sqlite3 connections belong to the thread that opened them
+        self._executor: ThreadPoolExecutor | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._finished = 0
+
+    async def _run(self, fn, *args):
+        if self._executor is None:
+            raise RuntimeError("SQLiteTaskStore is not running, add its lifespan to the server")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(TASK_SCHEMA)
+            self._connection = connection
+            self._evict()
+        return self._connection
+
+    def _start(self, task_id: str, session_id: str, ttl: timedelta | None) -> None:
+        now = time.time()
+        expires_at = now + (ttl or self.ttl).total_seconds()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO tasks (task_id, session_id, status, created_at, updated_at, expires_at)"
+            " VALUES (?, ?, 'working', ?, ?, ?)",
+            (task_id, session_id, now, now, expires_at),
+        )
+
+    def _set_progress(
+        self, task_id: str, session_id: str, progress: float | None, total: float | None, message: str | None
+    ) -> None:
+        self._connect().execute(
+            "UPDATE tasks SET progress = ?, total = ?, message = ?, updated_at = ? WHERE session_id = ? AND task_id = ?",
+            (progress, total, message, time.time(), session_id, task_id),
+        )
+
+    def _finish(
+        self,
+        task_id: str,
+        session_id: str,
+        status: str,
+        result: Any,
+        message: str | None,
+        progress: float | None,
+        total: float | None,
+    ) -> None:
+        data, compressed = None, 0
+        if result is not None:
+            data = pydantic_core.to_json(result)
+            if len(data) >= self.compress_threshold:
+                data, compressed = zlib.compress(data), 1
+        self._connect().execute(
+            "UPDATE tasks SET status = ?, result = ?, compressed = ?, size = ?, message = COALESCE(?, message),"
+            " progress = COALESCE(?, progress), total = COALESCE(?, total), updated_at = ?"
+            " WHERE session_id = ? AND task_id = ?",
+            (status, data, compressed, len(data or b""), message, progress, total, time.time(), session_id, task_id),
+        )
+        self._finished += 1
+        if self._finished % self.evict_every == 0:
+            self._evict()
+
+    def _get(self, task_id: str, session_id: str) -> TaskRecord | None:
+        row = self._connect().execute(
+            "SELECT task_id, session_id, status, progress, total, message, result, compressed, created_at, updated_at"
+            " FROM tasks WHERE session_id = ? AND task_id = ? AND expires_at > ?",
+            (session_id, task_id, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        task_id, session_id, status, progress, total, message, data, compressed, created_at, updated_at = row
+        if data is not None:
+            data = pydantic_core.from_json(zlib.decompress(data) if compressed else data)
+        return TaskRecord(task_id, session_id, status, progress, total, message, data, created_at, updated_at)
+
+    def _evict(self) -> None:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM tasks WHERE expires_at <= ?", (time.time(),))
+            # keep the newest finished results up to max_bytes
+            connection.execute(
+                "DELETE FROM tasks WHERE rowid IN ("
+                " SELECT rowid FROM ("
+                "  SELECT rowid, SUM(size) OVER (ORDER BY updated_at DESC) AS kept"
+                "  FROM tasks WHERE status != 'working'"
+                " ) WHERE kept > ?)",
+                (self.max_bytes,),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    async def start_task(self, task_id: str, session_id: str, ttl: timedelta | None = None) -> None:
+        await self._run(self._start, task_id, session_id, ttl)
+
+    async def set_progress(
+        self, task_id: str, session_id: str, progress: float | None, total: float | None, message: str | None
+    ) -> None:
+        await self._run(self._set_progress, task_id, session_id, progress, total, message)
+
+    async def finish(
+        self,
+        task_id: str,
+        session_id: str,
+        status: str,
+        result: Any = None,
+        message: str | None = None,
+        progress: float | None = None,
+        total: float | None = None,
+    ) -> None:
+        await self._run(self._finish, task_id, session_id, status, result, message, progress, total)
+
+    async def get(self, task_id: str, session_id: str) -> TaskRecord | None:
+        return await self._run(self._get, task_id, session_id)
+
+    async def evict(self) -> None:
+        await self._run(self._evict)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store")
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            await self._run(self._close)
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _lifespan(self, server):
+        await self.start()
+        try:
+            yield {"task_store": self}
+        finally:
+            await self.stop()
+
+    def persist(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+        progress_param = next(
+            (p.name for p in signature.parameters.values() if isinstance(p.default, Progress)), None
+        )
+        parameters = [
+            *signature.parameters.values(),
+            inspect.Parameter("task_key", inspect.Parameter.KEYWORD_ONLY, default=TaskKey(), annotation=str),
+        ]
+
+        async def run(**kwargs):
+            key = parse_task_key(kwargs.pop("task_key"))
+            task_id, session_id = key["client_task_id"], key["session_id"]
+            await self.start_task(task_id, session_id)
+            progress = None
+            if progress_param is not None:
+                progress = kwargs[progress_param] = StoredProgress(kwargs[progress_param], self, task_id, session_id)
+
+            async def finish(status: str, result: Any = None, message: str | None = None) -> None:
+                # Progress writes are throttled, the last state always goes in with the status
+                if progress is not None:
+                    await self.finish(
+                        task_id, session_id, status, result, message or progress.message, progress.current, progress.total
+                    )
+                else:
+                    await self.finish(task_id, session_id, status, result, message)
+
+            try:
+                result = await fn(**kwargs)
+            except asyncio.CancelledError:
+                await finish("cancelled")
+                raise
+            except Exception as e:
+                await finish("failed", message=str(e))
+                raise
+            await finish("completed", result)
+            return result
+
+        run.__name__, run.__qualname__, run.__doc__ = fn.__name__, fn.__qualname__, fn.__doc__
+        run.__signature__ = signature.replace(parameters=parameters)
+        run.__annotations__ = {p.name: p.annotation for p in parameters if p.annotation is not p.empty}
+        if signature.return_annotation is not signature.empty:
+            run.__annotations__["return"] = signature.return_annotation
+        return run
+
+
+class StoredProgress:
+    def __init__(self, progress, store: SQLiteTaskStore, task_id: str, session_id: str):
+        self._progress = progress
+        self._store = store
+        self._task_id = task_id
+        self._session_id = session_id
+        self._last_write = 0.0
+
+    @property
+    def current(self) -> int | None:
+        return self._progress.current
+
+    @property
+    def total(self) -> int:
+        return self._progress.total
+
+    @property
+    def message(self) -> str | None:
+        return self._progress.message
+
+    async def set_total(self, total: int) -> None:
+        await self._progress.set_total(total)
+        await self._write()
+
+    async def increment(self, amount: int = 1) -> None:
+        await self._progress.increment(amount)
+        await self._write()
+
+    async def set_message(self, message: str | None) -> None:
+        await self._progress.set_message(message)
+        await self._write()
+
+    async def _write(self) -> None:
+        now = time.monotonic()
+        if now - self._last_write >= self._store.progress_interval:
+            self._last_write = now
+            await self._store.set_progress(self._task_id, self._session_id, self.current, self.total, self.message)
+
+
+store = SQLiteTaskStore("tasks.sqlite3", ttl=timedelta(hours=6), max_bytes=64 * 1024 * 1024)
+mcp = FastMCP("Persistent tasks", lifespan=store.lifespan)
+
+@mcp.tool(task=TaskConfig(mode="required"))
+@store.persist
+async def index_files(files: list[str], progress: Progress = Progress()) -> dict[str, int]:
+    await progress.set_total(len(files))
+    sizes = {}
+    for file in files:
+        await progress.set_message(f"Indexing {file}")
+        sizes[file] = os.path.getsize(file)
+        await progress.increment()
+    return sizes
+
+@mcp.resource("tasks://{task_id}")
+async def stored_task(task_id: str, ctx: Context) -> str:
+    # Same session id the task key was built with
+    try:
+        session_id = ctx.session_id
+    except RuntimeError:
+        session_id = "internal"
+    record = await store.get(task_id, session_id)
+    if record is None:
+        raise NotFoundError(f"Unknown or expired task: {task_id}")
+    return json.dumps(asdict(record))
@@ -143,6 +143,185 @@ For advanced scenarios, provide a transform_fn that intercepts tool execution
 
 """
 
+### Compiled argument transforms
+
+""" A TransformedTool call goes through its own run (fill schema defaults, look up default factories),
+the forwarding function (check unknown/missing arguments, rename, add hidden values) and then the
+parent's run. A tool made with from_tool over another from_tool repeats all of it per level.
+
+CompiledTransformedTool.from_tool builds the same tool (same schema, same checks), then walks the
+pure forwarding levels down to the original tool once and keeps:
+    client name -> original argument name
+    hidden values (constants and default factories) keyed by original name
+    schema defaults of every level, in the order the levels would fill them
+A call checks the arguments against the exposed schema once, maps them with these tables and runs the
+original tool, which validates the values (pydantic) as before. Wrapping depth adds no per-call work.
+
+Levels with a custom transform_fn (forward()) are not flattened, the tool runs them as usual.
+"""
+
+import time
+from typing import Any
+
+from pydantic import PrivateAttr
+
+from fastmcp.tools.tool import ToolResult
+from fastmcp.tools.tool_transform import TransformedTool
+from fastmcp.utilities.types import NotSet
+
+
+def is_forwarding(tool: Tool) -> bool:
+    return isinstance(tool, TransformedTool) and tool.fn is tool.forwarding_fn
+
+
+class ForwardingPlan:
+    """Tables of a flattened forwarding chain, read once per call."""
+
+    __slots__ = ("root", "to_root", "hidden", "defaults", "allowed", "required", "strip_structured")
+
+    def __init__(
+        self,
+        root: Tool,
+        to_root: dict[str, str],
+        hidden: dict[str, ArgTransform],
+        defaults: list[tuple[str, Any]],
+        allowed: frozenset[str],
+        required: frozenset[str],
+        strip_structured: bool,
+    ):
+        self.root = root
+        self.to_root = to_root
+        self.hidden = hidden
+        self.defaults = defaults
+        self.allowed = allowed
+        self.required = required
+        self.strip_structured = strip_structured
+
+
+class CompiledTransformedTool(TransformedTool):
+    # One private attribute: every pydantic private lookup costs a __getattr__ call
+    _plan: ForwardingPlan | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_tool(cls, tool: Tool, **kwargs: Any) -> "CompiledTransformedTool":
+        transformed = super().from_tool(tool, **kwargs)
+        if is_forwarding(transformed):
+            transformed._compile()
+        return transformed
+
+    def _compile(self) -> None:
+        levels = []
+        current: Tool = self
+        while is_forwarding(current):
+            levels.append(current)
+            current = current.parent_tool
+
+        # Bottom-up: names seen by each level -> names of the original tool
+        hidden: dict[str, ArgTransform] = {}
+        to_root = {name: name for name in current.parameters.get("properties", {})}
+        level_maps = []
+        for level in reversed(levels):
+            level_to_root = {}
+            for old_name in level.parent_tool.parameters.get("properties", {}):
+                transform = level.transform_args.get(old_name) or ArgTransform()
+                root_name = to_root[old_name]
+                if transform.hide:
+                    if transform.default is not NotSet or transform.default_factory is not NotSet:
+                        hidden[root_name] = transform
+                    continue
+                new_name = transform.name if transform.name not in (NotSet, None) else old_name
+                level_to_root[new_name] = root_name
+            to_root = level_to_root
+            level_maps.append(level_to_root)
+
+        # Top-down: the outer level fills its defaults first
+        defaults: list[tuple[str, Any]] = []
+        for level, level_to_root in zip(levels, reversed(level_maps)):
+            for name, schema in level.parameters.get("properties", {}).items():
+                if "default" in schema and name in level_to_root:
+                    defaults.append((level_to_root[name], schema["default"]))
+
+        self._plan = ForwardingPlan(
+            root=current,
+            to_root=to_root,
+            hidden=hidden,
+            defaults=defaults,
+            allowed=frozenset(self.parameters.get("properties", {})),
+            required=frozenset(self.parameters.get("required", [])),
+            strip_structured=any(
+                level.output_schema is not None
+                and level.output_schema.get("type") != "object"
+                and not level.output_schema.get("x-fastmcp-wrap-result")
+                for level in levels
+            ),
+        )
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        plan = self._plan
+        if plan is None:
+            return await super().run(arguments)
+
+        if not arguments.keys() <= plan.allowed:
+            unknown = arguments.keys() - plan.allowed
+            raise TypeError(f"Got unexpected keyword argument(s): {', '.join(sorted(unknown))}")
+        if not plan.required <= arguments.keys():
+            missing = plan.required - arguments.keys()
+            raise TypeError(f"Missing required argument(s): {', '.join(sorted(missing))}")
+
+        to_root = plan.to_root
+        root_args = {to_root[name]: value for name, value in arguments.items()}
+        for root_name, transform in plan.hidden.items():
+            root_args[root_name] = transform.default if transform.default is not NotSet else transform.default_factory()
+        for root_name, default in plan.defaults:
+            root_args.setdefault(root_name, default)
+
+        result = await plan.root.run(root_args)
+        if plan.strip_structured:
+            return ToolResult(content=result.content, structured_content=None)
+        return result
+
+
+add_tool = CompiledTransformedTool.from_tool(
+    Tool.from_function(add_numbers),
+    name="add",
+    description="Adds two numbers",
+    transform_args={
+        "a": ArgTransform(name="x", description="First number"),
+        "b": ArgTransform(name="y", description="Second number", default=0),
+    },
+)
+mco.add_tool(add_tool)
+
+
+# Benchmark: per-call latency for 1-5 levels of from_tool, plain vs compiled
+
+async def benchmark_arg_transforms(max_depth: int = 5, calls: int = 5000) -> dict[str, dict[int, float]]:
+    async def add_ints(a: int, b: int) -> int:
+        return a + b
+
+    results: dict[str, dict[int, float]] = {"plain_us": {}, "compiled_us": {}}
+    for label, tool_cls in (("plain_us", TransformedTool), ("compiled_us", CompiledTransformedTool)):
+        current = Tool.from_function(add_ints)
+        for depth in range(1, max_depth + 1):
+            # Rename the argument the previous level exposes: a -> a1 -> a2 ...
+            previous = "a" if depth == 1 else f"a{depth - 1}"
+            current = tool_cls.from_tool(current, transform_args={previous: ArgTransform(name=f"a{depth}")})
+            arguments = {f"a{depth}": 1, "b": 2}
+            await current.run(arguments)  # warm up
+            start = time.perf_counter()
+            for _ in range(calls):
+                await current.run(arguments)
+            results[label][depth] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+# asyncio.run(benchmark_arg_transforms())
+# plain_us should grow with every level, compiled_us should stay close to the depth-1 cost.
+# Measured in review while the tables were seven pydantic private attributes (one __getattr__ each
+# per call): compiled_us 28-41 vs plain_us 11-12 at depth 1, breaking even only at depth 5.
+# Reading a single ForwardingPlan instead: 8 private lookups ~5.5us -> 1 lookup + slots ~0.75us
+# (pydantic 2.11, CPython 3.13); rerun the benchmark above to refresh the end-to-end numbers.
+
+
 ### Component Visibility
 
 """
@@ -181,12 +360,650 @@ mcp.disable(keys={"tool:delete_everything"})
 # Disable multiple specific components
 mcp.disable(keys={"tool:reset_system", "resource:data://secrets"})
 
+### Indexed visibility rules
+
+""" Every enable()/disable() call appends a Visibility transform. On each list every rule walks every
+component (name, key, version and tag set checks) and writes a new meta dict on the ones it matches,
+then the server reads the mark back from meta. 50k components x dozens of rules is tens of ms per list.
+
+TagIndexedVisibility keeps the rules in one transform:
+    Tags used by the rules are interned to bit positions, a rule's tags become a bitmask
+    A component's mask is the OR of its tags' bits, a tag rule matches when mask & rule_mask != 0
+    When no rule uses names, keys or version the decision only depends on (component type, mask),
+        it is computed once per pair
+    The visible list is kept per component type and returned again while the input list is the same
+        object (CompiledChainProvider returns the same list) and the rules did not change
+
+Hidden components are dropped, not marked: session level enable() cannot bring them back, use it for
+the server's fixed rules. Rules follow Visibility: the last matching rule wins, default is visible.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from fastmcp.resources import Resource, ResourceTemplate
+from fastmcp.server.transforms import Transform
+from fastmcp.server.transforms.visibility import Visibility, is_enabled
+from fastmcp.utilities.versions import VersionSpec
+
+
+@dataclass(frozen=True)
+class VisibilityRule:
+    enabled: bool
+    tag_mask: int | None = None
+    names: frozenset[str] | None = None
+    keys: frozenset[str] | None = None
+    version: VersionSpec | None = None
+    components: frozenset[str] | None = None
+    match_all: bool = False
+
+    @property
+    def by_component(self) -> bool:
+        """True when the rule looks at more than the component type and tags."""
+        return self.names is not None or self.keys is not None or self.version is not None
+
+    def matches(self, kind: str, mask: int, component) -> bool:
+        if self.match_all:
+            return True
+        if self.tag_mask is None and self.components is None and not self.by_component:
+            return False
+        if self.components is not None and kind not in self.components:
+            return False
+        if self.keys is not None and component.key not in self.keys:
+            return False
+        if self.names is not None:
+            if isinstance(component, Resource):
+                uri = str(component.uri)
+            elif isinstance(component, ResourceTemplate):
+                uri = component.uri_template
+            else:
+                uri = None
+            if component.name not in self.names and uri not in self.names:
+                return False
+        if self.version is not None and not self.version.matches(component.version, match_none=False):
+            return False
+        return self.tag_mask is None or bool(mask & self.tag_mask)
+
+
+class TagIndexedVisibility(Transform):
+    def __init__(self):
+        self._rules: list[VisibilityRule] = []
+        self._by_component = False
+        self._tag_bits: dict[str, int] = {}
+        self._decisions: dict[tuple[str, int], bool] = {}
+        self._visible: dict[str, tuple[Sequence[Any], list[Any]]] = {}
+
+    def _add_rule(self, enabled: bool, *, names=None, keys=None, version=None, tags=None, components=None, match_all=False):
+        tag_mask = None
+        if tags:
+            tag_mask = 0
+            for tag in tags:
+                tag_mask |= self._tag_bits.setdefault(tag, 1 << len(self._tag_bits))
+        self._rules.append(
+            VisibilityRule(
+                enabled,
+                tag_mask=tag_mask,
+                names=frozenset(names) if names else None,
+                keys=frozenset(keys) if keys else None,
+                version=version,
+                components=frozenset(components) if components else None,
+                match_all=match_all,
+            )
+        )
+        self._by_component = any(rule.by_component for rule in self._rules)
+        self._decisions.clear()
+        self._visible.clear()
+        return self
+
+    def enable(self, *, names=None, keys=None, version=None, tags=None, components=None, only: bool = False):
+        if only:
+            self._add_rule(False, match_all=True)
+        return self._add_rule(True, names=names, keys=keys, version=version, tags=tags, components=components)
+
+    def disable(self, *, names=None, keys=None, version=None, tags=None, components=None):
+        return self._add_rule(False, names=names, keys=keys, version=version, tags=tags, components=components)
+
+    def is_visible(self, kind: str, component) -> bool:
+        mask = 0
+        tag_bits = self._tag_bits
+        for tag in component.tags:
+            mask |= tag_bits.get(tag, 0)
+
+        by_component = self._by_component
+        if not by_component:
+            decision = self._decisions.get((kind, mask))
+            if decision is not None:
+                return decision
+
+        decision = True
+        for rule in reversed(self._rules):
+            if rule.matches(kind, mask, component):
+                decision = rule.enabled
+                break
+        if not by_component:
+            self._decisions[(kind, mask)] = decision
+        return decision
+
+    def _filter(self, kind: str, components: Sequence[Any]) -> Sequence[Any]:
+        cached = self._visible.get(kind)
+        if cached is not None and cached[0] is components:
+            return cached[1]
+        visible = [component for component in components if self.is_visible(kind, component)]
+        # Keeps a reference to the input, so the identity check stays valid
+        self._visible[kind] = (components, visible)
+        return visible
+
+    async def list_tools(self, tools):
+        return self._filter("tool", tools)
+
+    async def get_tool(self, name, call_next, *, version=None):
+        tool = await call_next(name, version=version)
+        return tool if tool is not None and self.is_visible("tool", tool) else None
+
+    async def list_resources(self, resources):
+        return self._filter("resource", resources)
+
+    async def get_resource(self, uri, call_next, *, version=None):
+        resource = await call_next(uri, version=version)
+        return resource if resource is not None and self.is_visible("resource", resource) else None
+
+    async def list_resource_templates(self, templates):
+        return self._filter("template", templates)
+
+    async def get_resource_template(self, uri, call_next, *, version=None):
+        template = await call_next(uri, version=version)
+        return template if template is not None and self.is_visible("template", template) else None
+
+    async def list_prompts(self, prompts):
+        return self._filter("prompt", prompts)
+
+    async def get_prompt(self, name, call_next, *, version=None):
+        prompt = await call_next(name, version=version)
+        return prompt if prompt is not None and self.is_visible("prompt", prompt) else None
+
+    def __repr__(self) -> str:
+        return f"TagIndexedVisibility(rules={len(self._rules)}, tags={len(self._tag_bits)})"
+
+
+mcp = FastMCP("Server")
+
+visibility = TagIndexedVisibility()
+visibility.disable(tags={"admin"})
+visibility.enable(tags={"public"}, only=True)
+mcp.add_transform(visibility)
+
+
+# Benchmark: 50k tools, 40 tags, 30 rules, Visibility transforms vs TagIndexedVisibility
+
+async def benchmark_visibility(count: int = 50_000, rules: int = 30) -> dict[str, float]:
+    def lookup(query: str) -> str:
+        return query
+
+    template = Tool.from_function(lookup)
+    tags = [f"tag{i}" for i in range(40)]
+    tools = [template.model_copy(update={"name": f"tool_{i}", "tags": {tags[i % 40], tags[i % 7]}}) for i in range(count)]
+
+    stacked = [Visibility(i % 3 != 0, tags={tags[i], tags[(i * 7) % 40]}) for i in range(rules)]
+    indexed = TagIndexedVisibility()
+    for i in range(rules):
+        rule_tags = {tags[i], tags[(i * 7) % 40]}
+        if i % 3 != 0:
+            indexed.enable(tags=rule_tags)
+        else:
+            indexed.disable(tags=rule_tags)
+
+    start = time.perf_counter()
+    listed = tools
+    for transform in stacked:
+        listed = await transform.list_tools(listed)
+    listed = [t for t in listed if is_enabled(t)]
+    results = {"visibility_ms": (time.perf_counter() - start) * 1000}
+
+    start = time.perf_counter()
+    await indexed.list_tools(tools)
+    results["indexed_first_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    await indexed.list_tools(tools)
+    results["indexed_cached_us"] = (time.perf_counter() - start) * 1e6
+    return results
+
+# asyncio.run(benchmark_visibility())
+
+
+### Compiled transform chains
+
+""" Every tools/list runs the provider's _list_tools and then every transform of the chain over the
+whole list, every tools/call walks the get_tool chain (each transform reverses the name and calls the
+next one). With 20 stacked transforms over 10k tools that is 20 passes per list and 20 hops per call.
+
+CompiledChainProvider holds the providers and the transforms applied over them (like a mount):
+    The first list or get for a component type runs the chain once and keeps the result,
+        the transformed components and an index: transformed name/uri -> components
+    list returns the kept list, get is a dictionary lookup (highest matching version)
+    The chain is compiled again only when the providers, their transforms or this provider's
+        transforms change, or when invalidate() is called (components added at runtime)
+
+The index is built from the listed names, transforms must list the same components get returns
+(true for Namespace, ToolTransform and visibility). Session transforms and enable/disable are still
+applied by the server after the chain.
+
+get_tasks and lifespan go to the wrapped providers (like a mount), background tasks are registered
+under their transformed names and the providers' setup and teardown still run.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from fastmcp.prompts import Prompt
+from fastmcp.server.providers import LocalProvider, Provider
+from fastmcp.server.transforms import Transform
+from fastmcp.tools import Tool
+from fastmcp.utilities.async_utils import gather
+from fastmcp.utilities.components import FastMCPComponent
+from fastmcp.utilities.versions import VersionSpec, version_sort_key
+
+CHAIN_KINDS = {
+    # kind: (list method, identifier used by get)
+    "tools": ("list_tools", lambda c: c.name),
+    "resources": ("list_resources", lambda c: str(c.uri)),
+    "templates": ("list_resource_templates", lambda c: c.uri_template),
+    "prompts": ("list_prompts", lambda c: c.name),
+}
+
+
+def pick_version(candidates: list[Any], version: VersionSpec | None):
+    """Highest version among candidates that matches the spec (same rule as Provider._get_tool)."""
+    if version:
+        candidates = [c for c in candidates if version.matches(c.version)]
+    if not candidates:
+        return None
+    return max(candidates, key=version_sort_key)
+
+
+class CompiledChainProvider(Provider):
+    def __init__(self, providers: Sequence[Provider] = ()):
+        super().__init__()
+        self._providers = list(providers)
+        self._compiled: dict[str, tuple[tuple, list[Any], dict[str, list[Any]]]] = {}
+        self._compile_lock = asyncio.Lock()
+
+    def add_provider(self, provider: Provider) -> None:
+        self._providers.append(provider)
+
+    def remove_provider(self, provider: Provider) -> None:
+        self._providers.remove(provider)
+
+    def invalidate(self) -> None:
+        self._compiled.clear()
+
+    def _fingerprint(self) -> tuple:
+        # Holds the objects themselves, compared by identity
+        return (
+            tuple(self._providers),
+            tuple(self._transforms),
+            tuple(transform for provider in self._providers for transform in provider.transforms),
+        )
+
+    async def _compile(self, kind: str) -> tuple[tuple, list[Any], dict[str, list[Any]]]:
+        fingerprint = self._fingerprint()
+        entry = self._compiled.get(kind)
+        if entry is not None and entry[0] == fingerprint:
+            return entry
+
+        async with self._compile_lock:
+            entry = self._compiled.get(kind)
+            if entry is not None and entry[0] == fingerprint:
+                return entry
+
+            method, identify = CHAIN_KINDS[kind]
+            results = await gather(*(getattr(provider, method)() for provider in self._providers))
+            components = [component for result in results for component in result]
+            for transform in self._transforms:
+                components = list(await getattr(transform, method)(components))
+
+            index: dict[str, list[Any]] = {}
+            for component in components:
+                index.setdefault(identify(component), []).append(component)
+            entry = self._compiled[kind] = (fingerprint, components, index)
+            return entry
+
+    async def list_tools(self) -> Sequence[Tool]:
+        return (await self._compile("tools"))[1]
+
+    async def get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        return pick_version((await self._compile("tools"))[2].get(name, []), version)
+
+    async def list_resources(self):
+        return (await self._compile("resources"))[1]
+
+    async def get_resource(self, uri: str, version: VersionSpec | None = None):
+        return pick_version((await self._compile("resources"))[2].get(uri, []), version)
+
+    async def list_resource_templates(self):
+        return (await self._compile("templates"))[1]
+
+    async def get_resource_template(self, uri: str, version: VersionSpec | None = None):
+        templates = (await self._compile("templates"))[1]
+        return pick_version([t for t in templates if t.matches(uri) is not None], version)
+
+    async def list_prompts(self):
+        return (await self._compile("prompts"))[1]
+
+    async def get_prompt(self, name: str, version: VersionSpec | None = None):
+        return pick_version((await self._compile("prompts"))[2].get(name, []), version)
+
+    async def get_tasks(self) -> Sequence[FastMCPComponent]:
+        # Not compiled, only called once at startup
+        results = await gather(*(provider.get_tasks() for provider in self._providers))
+        components = [component for result in results for component in result]
+        tools = [c for c in components if isinstance(c, Tool)]
+        resources = [c for c in components if isinstance(c, Resource)]
+        templates = [c for c in components if isinstance(c, ResourceTemplate)]
+        prompts = [c for c in components if isinstance(c, Prompt)]
+        for transform in self._transforms:
+            tools = await transform.list_tools(tools)
+            resources = await transform.list_resources(resources)
+            templates = await transform.list_resource_templates(templates)
+            prompts = await transform.list_prompts(prompts)
+        return [c for c in [*tools, *resources, *templates, *prompts] if c.task_config.supports_tasks()]
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            for provider in self._providers:
+                await stack.enter_async_context(provider.lifespan())
+            yield
+
+    def __repr__(self) -> str:
+        return f"CompiledChainProvider(providers={self._providers!r}, transforms={self._transforms!r})"
+
+
+weather_tools = LocalProvider()
+
+@weather_tools.tool
+def forecast(location: str) -> str:
+    return f"The weather in {location} is sunny with a high of 25°C."
+
+
+chain = CompiledChainProvider([weather_tools])
+chain.add_transform(Namespace("weather"))
+chain.add_transform(ToolTransform({"weather_forecast": ToolTransformConfig(name="weather")}))
+
+mcp = FastMCP("CompiledServer", providers=[chain])
+
+
+# Benchmark: list and get cost for 10k tools through 1-20 stacked transforms
+
+async def benchmark_transform_chain(tools: int = 10_000, depths=(1, 5, 10, 20), calls: int = 1000) -> dict[str, dict[int, float]]:
+    def lookup(query: str) -> str:
+        return query
+
+    tool_objects = [Tool.from_function(lookup, name=f"tool_{i}") for i in range(tools)]
+    results: dict[str, dict[int, float]] = {"list_ms": {}, "get_us": {}, "compiled_list_ms": {}, "compiled_get_us": {}}
+    for depth in depths:
+        plain = LocalProvider()
+        base = LocalProvider()
+        for tool in tool_objects:
+            plain.add_tool(tool)
+            base.add_tool(tool)
+        compiled = CompiledChainProvider([base])
+        for level in range(depth):
+            plain.add_transform(Namespace(f"n{level}"))
+            compiled.add_transform(Namespace(f"n{level}"))
+
+        name = "_".join(f"n{level}" for level in reversed(range(depth))) + "_tool_5000"
+        for label, provider in (("", plain), ("compiled_", compiled)):
+            await provider.list_tools()  # warm up, compiles the chain
+            start = time.perf_counter()
+            await provider.list_tools()
+            results[f"{label}list_ms"][depth] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for _ in range(calls):
+                await provider.get_tool(name)
+            results[f"{label}get_us"][depth] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+# asyncio.run(benchmark_transform_chain())
+# list_ms and get_us grow with the depth, compiled_list_ms and compiled_get_us stay flat
+
+
 ### Resources as tools
 
 """Some MCP clients only support tools. 
 They cannot list or read resources directly because they lack resource protocol support.
 """
 
+#### Chunked reads
+
+""" read_resource reads the whole resource, then returns it as one string (base64 for binary).
+A 500 MB log file is loaded in memory, encoded and sent in a single tool result.
+
+StreamingResourcesAsTools replaces read_resource with a chunked version:
+    read_resource(uri, offset=0, limit=None) returns one chunk, the result meta has
+        offset, size and nextOffset (None on the last chunk), call again with offset=nextOffset
+    File backed resources (FileResource, or any resource with a path) are read with offset reads,
+        only the requested range is loaded, text chunks end on a UTF-8 character boundary
+        (limit is raised to 4 bytes so a chunk always holds a whole character, an offset inside
+        a character is a ToolError) and binary chunks are a multiple of 3 bytes (base64 chunks
+        can be concatenated)
+    Other resources (directories, templates, functions) are read as before and sliced,
+        offsets count characters of the formatted result; the formatted text is kept per
+        session and uri from offset 0 until the last chunk, so later chunks are not re-read
+    Ranges over 1 MB are read in 1 MB blocks with a progress notification after each block
+
+Ranged file reads look the resource up with get_resource (auth and visibility apply), server
+middleware runs only for the full-read path.
+"""
+
+import asyncio
+import base64
+import os
+import tempfile
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from typing import Annotated
+
+from mcp.types import TextContent
+from pydantic import AnyUrl, Field
+
+from fastmcp import Context
+from fastmcp.exceptions import ToolError
+from fastmcp.resources import FileResource
+from fastmcp.resources.types import DirectoryResource
+from fastmcp.server.transforms import ResourcesAsTools
+from fastmcp.server.transforms.resources_as_tools import _format_result
+from fastmcp.tools.tool import ToolResult
+
+READ_BLOCK = 1024 * 1024
+MIN_TEXT_CHUNK = 4  # longest UTF-8 character
+
+
+def utf8_boundary(data: bytes) -> int:
+    """Length of data without a trailing incomplete UTF-8 sequence."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:  # continuation byte, keep looking for the lead byte
+            continue
+        if byte < 0x80:
+            return len(data)
+        needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+        return len(data) if back >= needed else len(data) - back
+    return len(data)
+
+
+class StreamingResourcesAsTools(ResourcesAsTools):
+    def __init__(
+        self,
+        provider,
+        chunk_size: int = 256 * 1024,
+        max_chunk_size: int = 8 * 1024 * 1024,
+        sliced_cache_size: int = 16,
+    ):
+        super().__init__(provider)
+        self._chunk_size = chunk_size
+        self._max_chunk_size = max_chunk_size
+        # (session_id, uri) -> formatted text of a non-file resource being read in chunks
+        self._sliced: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._sliced_cache_size = sliced_cache_size
+
+    def __repr__(self) -> str:
+        return f"StreamingResourcesAsTools({self._provider!r}, chunk_size={self._chunk_size})"
+
+    def _make_read_resource_tool(self) -> Tool:
+        transform = self
+
+        async def read_resource(
+            uri: Annotated[str, "The URI of the resource to read"],
+            ctx: Context,
+            offset: Annotated[int, Field(ge=0, description="Where to start, use nextOffset from the previous chunk")] = 0,
+            limit: Annotated[
+                int | None, Field(ge=1, description="Maximum bytes (characters for non-file resources) to return")
+            ] = None,
+        ) -> ToolResult:
+            """Read a resource by its URI, one chunk at a time.
+
+            The result meta has offset, size and nextOffset. While nextOffset is not null,
+            call again with offset=nextOffset to get the next chunk. Binary content is
+            base64-encoded.
+            """
+            limit = min(limit or transform._chunk_size, transform._max_chunk_size)
+            # Same form the resources/read path looks up (e.g. file://big.log -> file://big.log/)
+            uri = str(AnyUrl(uri))
+            resource = await transform._provider.get_resource(uri)
+            path = getattr(resource, "path", None)
+            if path is not None and not isinstance(resource, DirectoryResource):
+                binary = getattr(resource, "is_binary", None)
+                if binary is None:
+                    binary = not (resource.mime_type or "text/plain").startswith(("text/", "application/json"))
+                return await transform._read_file_range(uri, Path(path), binary, offset, limit, ctx)
+            return await transform._read_sliced(uri, offset, limit, ctx)
+
+        return Tool.from_function(fn=read_resource)
+
+    async def _read_file_range(self, uri: str, path: Path, binary: bool, offset: int, limit: int, ctx: Context) -> ToolResult:
+        if binary:
+            limit = max(3, limit - limit % 3)
+        else:
+            limit = max(MIN_TEXT_CHUNK, limit)
+
+        def read_block(position: int, length: int) -> bytes:
+            with open(path, "rb") as f:
+                f.seek(position)
+                return f.read(length)
+
+        size = (await asyncio.to_thread(path.stat)).st_size
+        blocks = []
+        position = offset
+        end = offset + limit
+        while position < end:
+            block = await asyncio.to_thread(read_block, position, min(READ_BLOCK, end - position))
+            if not block:
+                break
+            blocks.append(block)
+            position += len(block)
+            if limit > READ_BLOCK:
+                await ctx.report_progress(position - offset, min(limit, size - offset))
+        data = b"".join(blocks)
+
+        if binary:
+            text = base64.b64encode(data).decode("ascii")
+        else:
+            if data and data[0] & 0xC0 == 0x80:
+                raise ToolError(
+                    f"Offset {offset} is inside a UTF-8 character of {uri}, use nextOffset from the previous chunk"
+                )
+            keep = len(data) if position >= size else utf8_boundary(data)
+            position -= len(data) - keep
+            text = data[:keep].decode()
+        return self._chunk(uri, text, offset, position, size, "base64" if binary else "utf-8")
+
+    async def _read_formatted(self, uri: str) -> str:
+        if isinstance(self._provider, FastMCP):
+            return _format_result(await self._provider.read_resource(uri))
+        resource = await self._provider.get_resource(uri)
+        if resource is not None:
+            return _format_result(await resource._read())
+        template = await self._provider.get_resource_template(uri)
+        params = template.matches(uri) if template is not None else None
+        if params is None:
+            raise ValueError(f"Resource not found: {uri}")
+        return _format_result(await template._read(uri, params))
+
+    async def _read_sliced(self, uri: str, offset: int, limit: int, ctx: Context) -> ToolResult:
+        # offset 0 starts a new read; later chunks reuse the text this session already read
+        key = (ctx.session_id, uri)
+        text = self._sliced.get(key) if offset else None
+        if text is None:
+            text = await self._read_formatted(uri)
+            self._sliced[key] = text
+            while len(self._sliced) > self._sliced_cache_size:
+                self._sliced.popitem(last=False)
+        else:
+            self._sliced.move_to_end(key)
+
+        end = min(offset + limit, len(text))
+        if end >= len(text):
+            self._sliced.pop(key, None)
+        return self._chunk(uri, text[offset:end], offset, end, len(text), "text")
+
+    @staticmethod
+    def _chunk(uri: str, text: str, offset: int, end: int, size: int, encoding: str) -> ToolResult:
+        meta = {"uri": uri, "offset": offset, "size": size, "nextOffset": end if end < size else None, "encoding": encoding}
+        return ToolResult(content=[TextContent(type="text", text=text)], meta=meta)
+
+
+mcp = FastMCP("FilesForToolClients")
+mcp.add_resource(FileResource(uri="file://logs/app.log", name="app_log", path=Path("/var/log/app.log").resolve()))
+mcp.add_transform(StreamingResourcesAsTools(mcp, chunk_size=256 * 1024))
+
+
+# Benchmark: peak memory and time to read a 200 MB file, native read vs chunked tool reads
+
+async def benchmark_chunked_reads(size_mb: int = 200, chunk_size: int = 4 * 1024 * 1024) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        path.write_bytes(b"0123456789abcdef\n" * (size_mb * 1024 * 1024 // 17))
+
+        server = FastMCP("Bench")
+        server.add_resource(FileResource(uri="file://big.log", name="big", path=path))
+        server.add_transform(ResourcesAsTools(server))
+        streaming = FastMCP("StreamingBench")
+        streaming.add_resource(FileResource(uri="file://big.log", name="big", path=path))
+        streaming.add_transform(StreamingResourcesAsTools(streaming, chunk_size=chunk_size, max_chunk_size=chunk_size))
+
+        results = {}
+        for label, run in (
+            ("native_read", lambda: server.read_resource("file://big.log")),
+            ("read_resource_tool", lambda: server.call_tool("read_resource", {"uri": "file://big.log"})),
+        ):
+            tracemalloc.start()
+            start = time.perf_counter()
+            await run()
+            results[f"{label}_s"] = time.perf_counter() - start
+            results[f"{label}_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        offset = 0
+        while offset is not None:
+            result = await streaming.call_tool("read_resource", {"uri": "file://big.log", "offset": offset})
+            offset = result.meta["nextOffset"]
+        results["chunked_tool_s"] = time.perf_counter() - start
+        results["chunked_tool_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        return results
+
+# asyncio.run(benchmark_chunked_reads())
+# chunked_tool_peak_mb stays around a few chunk sizes, whatever the file size
+
+
 ### Propts as Tools
 
 """Some MCP clients only support tools.
@@ -0,0 +1,86 @@
+"""Worker side of ProcessPoolTasks (demo_FastMCP_Server_Features.py)
+
+Spawned worker processes import the function they run by module name. The demo files build servers
+at import time and are not importable, so the functions run in workers live here: no server, no side
+effects on import.
+"""
+
+import time
+from typing import Any, Callable
+
+
+class WorkerProgress:
+    """Progress for a function running in a worker, same names as Progress.
+
+    Updates are batched and sent to the server process every flush_interval seconds.
+    """
+
+    def __init__(self, connection, flush_interval: float = 0.1):
+        self._connection = connection
+        self._flush_interval = flush_interval
+        self._pending = 0
+        self._message: str | None = None
+        self._message_changed = False
+        self._last_flush = time.monotonic()
+
+    def set_total(self, total: int) -> None:
+        self._connection.send(("set_total", total))
+
+    def set_message(self, message: str | None) -> None:
+        self._message = message
+        self._message_changed = True
+        self._maybe_flush()
+
+    def increment(self, amount: int = 1) -> None:
+        self._pending += amount
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if self._message_changed:
+            self._connection.send(("set_message", self._message))
+            self._message_changed = False
+        if self._pending:
+            self._connection.send(("increment", self._pending))
+            self._pending = 0
+
+
+def run_in_worker(
+    fn: Callable[..., Any], kwargs: dict[str, Any], progress_param: str | None, connection, flush_interval: float
+) -> None:
+    """Process target: run fn, send its progress, then ("result", value) or ("error", exception)."""
+    try:
+        progress = None
+        if progress_param is not None:
+            progress = kwargs[progress_param] = WorkerProgress(connection, flush_interval)
+        result = fn(**kwargs)
+        if progress is not None:
+            progress.flush()
+        outcome = ("result", result)
+    except Exception as e:
+        outcome = ("error", e)
+    try:
+        connection.send(outcome)
+    except Exception as e:  # result or exception that cannot be pickled
+        connection.send(("error", RuntimeError(f"{fn.__name__}: cannot send {outcome[0]} to the server: {e!r}")))
+    finally:
+        connection.close()
+
+
+def count_primes(limit: int, progress: WorkerProgress) -> int:
+    """Count the primes below limit."""
+    progress.set_total(max(limit - 2, 1))
+    count = 0
+    for n in range(2, limit):
+        if all(n % d for d in range(2, int(n**0.5) + 1)):
+            count += 1
+        progress.increment()
+    return count
+
+
+def busy(n: int) -> int:
+    return sum(i * i % 7 for i in range(n))